@@ -1,9 +1,24 @@
 import json, math, random, time
 from collections import defaultdict
 
+from persistence import default_service
+from amygdala_trace import TraceSink
+from amygdala_vector import EmotionVector
+
+
+BACKENDS = ("dict", "numpy")
+DECAY_MODES = ("linear", "exponential")
+RESUM_EVERY = 512                        # incremental writes between exact re-sums of the metric sums
+
+
+def _xlogx(v):
+    return v * math.log(v) if v > 0 else 0.0
+
 
 class Amygdala:
-    def __init__(self, debug=False):
+    def __init__(self, debug=False, backend="dict"):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}; use one of {BACKENDS}")
         self.debug = debug
         self.emotional_core = {
             "joy":0.0,"sadness":0.0,"anger":0.0,"fear":0.0,
@@ -19,26 +34,44 @@ class Amygdala:
             "gratitude":"frustration","focus":"curiosity","curiosity":"focus",
             "bond":"anticipation","anticipation":"bond","wonder":"focus"
         }
+        # "numpy" keeps the core in an array behind the same mapping API (needs NumPy);
+        # an opt-in layout for array consumers, no faster than the dict at 18 emotions.
+        self._vector = EmotionVector(self.emotional_core, self.antagonists) if backend == "numpy" else None
+        if self._vector is not None:
+            self.emotional_core = self._vector
         self.stage = "Calm"
+        # Running sums over the non-neutral emotions: Σv, Σv², Σv·log v, and how many are above 0.
+        self._feelings = sum(1 for k in self.emotional_core if k != "neutral")
+        self._resum()
+        self._update_stage_and_metrics()
+        self.lazy_decay = None           # (rate, interval, exponential) once set_decay() is on
+        self._settled_tick = 0
         self._log_tick = 0
+        self.export_every = 5            # traced writes between emotional_growth_log.json exports (0: off)
+        self.trace_sink = None           # TraceSink while open_trace() is on
         self._last_beat = time.time()
+        self.persistence = default_service()   # background writer for saves and the growth log
 
     # ---------- VISION INTEGRATION ----------
     def ingest_visual(self, visual_data, trace=False):
         if not visual_data or "symbols" not in visual_data:
             return "[⚠️] Invalid visual input."
 
-        responses = []
+        responses, deltas = [], {}
         for item in visual_data["symbols"]:
             obj = item.get("object")
             symbol = item.get("symbol")
             emotion = self._map_symbol_to_emotion(symbol)
             if emotion:
                 delta = 0.05 + random.uniform(0.01, 0.1)
-                pkt = self.inject_emotion(emotion, strength=delta, trace=trace)
-                responses.append(pkt or f"[🧠👁️] Symbol '{symbol}' → Emotion '{emotion}' Δ{delta:.2f}")
+                deltas[emotion] = deltas.get(emotion, 0.0) + delta
+                responses.append(f"[🧠👁️] Symbol '{symbol}' → Emotion '{emotion}' Δ{delta:.2f}")
+        if not deltas:
+            return "[🧠👁️] No emotional triggers from input."
 
-        return responses if responses else "[🧠👁️] No emotional triggers from input."
+        # One write for the whole frame: homeostasis, metrics and trace run once.
+        pkt = self.apply_deltas(deltas, trace=trace)
+        return [pkt] if pkt else responses
 
     def _map_symbol_to_emotion(self, symbol):
         symbol_emotion_map = {
@@ -53,9 +86,11 @@ class Amygdala:
 
     # ---------- READ ----------
     def get_emotions(self):
+        self._settle()
         return self.emotional_core.copy()
 
     def get_dominant(self, top_n: int = 3, min_thresh: float = 0.12):
+        self._settle()
         s = sorted(self.emotional_core.items(), key=lambda kv: kv[1], reverse=True)
         dom = [k for k, v in s if v >= min_thresh and k != "neutral"][:top_n]
         return dom or ["neutral"]
@@ -69,13 +104,11 @@ class Amygdala:
 
     def adjust_emotion(self, name: str, delta: float = 0.1, trace=False):
         name = name.lower()
-        if name not in self.emotional_core: return None
-        old = self.emotional_core[name]
-        self.emotional_core[name] = max(0.0, min(1.0, old + delta))
-
-        opp = self.antagonists.get(name)
-        if opp and delta != 0:
-            self.emotional_core[opp] = max(0.0, min(1.0, self.emotional_core[opp] - 0.5*delta))
+        self._settle()
+        changed = self._adjust(name, delta)
+        if changed is None: return None
+        old = changed[name][0]
+        self._account(changed)
 
         self._homeostasis()
         self._update_stage_and_metrics()
@@ -84,48 +117,152 @@ class Amygdala:
             print(f"[Amygdala] {name}: {old:.2f} → {self.emotional_core[name]:.2f} (Δ{delta:+.2f})")
         return pkt if trace else None
 
+    def apply_deltas(self, deltas, trace=False):
+        """Adjust several emotions as one write: each {name: delta} (and its antagonist's
+        -delta/2) lands in order, then homeostasis, metrics and the trace run once."""
+        self._settle()
+        changed = {}
+        for name, delta in deltas.items():
+            moved = self._adjust(name.lower(), delta)
+            for e, (v, nv) in (moved or {}).items():
+                changed[e] = (changed[e][0] if e in changed else v, nv)
+        if not changed: return None
+        self._account(changed)
+
+        self._homeostasis(); self._update_stage_and_metrics()
+        pkt = self._trace("apply", deltas=dict(deltas), changed=changed)
+        if self.debug:
+            for e, (v, nv) in changed.items(): print(f"[Amygdala] {e}: {v:.2f} → {nv:.2f}")
+        return pkt if trace else None
+
     def set_emotion(self, name: str, value: float, trace=False):
         name = name.lower()
         if name not in self.emotional_core: return None
+        self._settle()
         old = self.emotional_core[name]
         clamped = max(0.0, min(1.0, value))
         self.emotional_core[name] = clamped
+        self._account({name: (old, clamped)})
         self._homeostasis(); self._update_stage_and_metrics()
         pkt = self._trace("set", name=name, old=old, new=clamped)
         if self.debug: print(f"[Amygdala] Set {name}: {old:.2f} → {clamped:.2f}")
         return pkt if trace else None
 
     def decay_emotions(self, rate: float = 0.01, trace=False):
-        changed = {}
-        for e, v in self.emotional_core.items():
-            nv = max(0.0, v - rate)
-            if nv != v:
-                self.emotional_core[e] = nv
-                changed[e] = (v, nv)
-                if self.debug: print(f"[Amygdala] Decayed {e}: {v:.2f} → {nv:.2f}")
+        self._settle()
+        changed = self._decay(rate, report=trace or self.debug)
+        if self.debug:
+            for e, (v, nv) in changed.items(): print(f"[Amygdala] Decayed {e}: {v:.2f} → {nv:.2f}")
+        self._resum()   # every emotion moved: exact sums cost no more than shifting them
         self._homeostasis(); self._update_stage_and_metrics()
         return self._trace("decay", changed=changed) if trace else None
 
+    def set_decay(self, rate=0.01, interval=0.75, mode="linear"):
+        """Decay on read instead of by calling decay_emotions every tick: each `interval`
+        seconds elapsed counts as one tick of `rate` (linear: v - rate, exponential:
+        v × (1 - rate)), applied in one step by the next read or write. rate=None stops it."""
+        if mode not in DECAY_MODES:
+            raise ValueError(f"Unknown decay mode {mode!r}; use one of {DECAY_MODES}")
+        self._settle()   # ticks owed under the old setting
+        if rate is None:
+            self.lazy_decay = None
+            return
+        self.lazy_decay = (rate, interval, mode == "exponential")
+        self._settled_tick = int(time.time() // interval)
+
     def randomize_emotion(self, trace=False):
+        self._settle()
         target = random.choice(list(self.emotional_core.keys()))
         old = self.emotional_core[target]
         new_val = round(random.uniform(0.1, 1.0), 2)
         self.emotional_core[target] = new_val
+        self._account({target: (old, new_val)})
         self._homeostasis(); self._update_stage_and_metrics()
         if self.debug: print(f"[Amygdala] Randomized {target}: {old:.2f} → {new_val:.2f}")
         return self._trace("randomize", name=target, old=old, new=new_val) if trace else target
 
     # ---------- METRICS / STAGING ----------
+    def _adjust(self, name, delta):
+        """Move `name` by `delta` and its antagonist by -delta/2 (clamped to [0, 1]);
+        {name: (old, new)} of the two, or None if `name` is not an emotion."""
+        if self._vector is not None:
+            return self._vector.adjust(name, delta)
+        if name not in self.emotional_core: return None
+        v = self.emotional_core[name]
+        changed = {name: (v, max(0.0, min(1.0, v + delta)))}
+        self.emotional_core[name] = changed[name][1]
+
+        opp = self.antagonists.get(name)
+        if opp and delta != 0:
+            v = self.emotional_core[opp]
+            changed[opp] = (v, max(0.0, min(1.0, v - 0.5*delta)))
+            self.emotional_core[opp] = changed[opp][1]
+        return changed
+
+    def _decay(self, rate, ticks=1, exponential=False, report=True):
+        """Apply `ticks` decay ticks to every emotion; {name: (old, new)} of those that moved
+        (the vector backend skips building it, returning None, without `report`)."""
+        if self._vector is not None:
+            return self._vector.decay(rate, ticks, exponential, report)
+        changed = {}
+        for e, v in self.emotional_core.items():
+            nv = v * (1.0 - rate)**ticks if exponential else max(0.0, v - rate*ticks)
+            if nv != v:
+                self.emotional_core[e] = nv
+                changed[e] = (v, nv)
+        return changed
+
+    def _settle(self):
+        # Lazy decay: bring the core up to now with the ticks elapsed since the last settle.
+        if self.lazy_decay is None:
+            return
+        rate, interval, exponential = self.lazy_decay
+        tick = int(time.time() // interval)
+        ticks = tick - self._settled_tick
+        if ticks <= 0:
+            return
+        self._settled_tick = tick
+        if not self._active:
+            return   # nothing above 0 to decay; neutral is derived
+        self._decay(rate, ticks, exponential, report=False)
+        self._resum()
+        self._homeostasis(); self._update_stage_and_metrics()
+
+    def _account(self, changed):
+        """Shift the running sums by {name: (old, new)} of the emotions a write moved."""
+        for e, (v, nv) in changed.items():
+            if e != "neutral":
+                self._energy += nv - v
+                self._square += nv*nv - v*v
+                self._vlogv += _xlogx(nv) - _xlogx(v)
+                self._active += (nv > 0) - (v > 0)
+        self._writes += 1
+        if self._writes >= RESUM_EVERY:
+            self._resum()   # bounds float drift of the running sums
+
+    def _resum(self):
+        if self._vector is not None:
+            self._energy, self._square, self._vlogv, self._active = self._vector.sums()
+        else:
+            vals = [v for k, v in self.emotional_core.items() if k != "neutral"]
+            self._energy = sum(vals)
+            self._square = sum(v*v for v in vals)
+            self._vlogv = sum(_xlogx(v) for v in vals)
+            self._active = sum(1 for v in vals if v > 0)
+        self._writes = 0
+
     def _homeostasis(self):
-        total_non_neutral = sum(v for k, v in self.emotional_core.items() if k != "neutral")
-        self.emotional_core["neutral"] = max(0.0, min(1.0, 1.0 - 0.5*min(1.0, total_non_neutral)))
+        if "neutral" in self.emotional_core:
+            self.emotional_core["neutral"] = max(0.0, min(1.0, 1.0 - 0.5*min(1.0, max(0.0, self._energy))))
 
     def _update_stage_and_metrics(self):
-        vals = [v for k, v in self.emotional_core.items() if k != "neutral"]
-        mean = sum(vals) / (len(vals) or 1)
-        var = sum((v-mean)**2 for v in vals) / (len(vals) or 1)
-        energy = sum(vals)
-        entropy = -sum((p:=v/max(1e-9,energy)) * math.log(p+1e-9) for v in vals if energy > 1e-9)
+        # O(1) from the running sums. Entropy of p = v/E is log E - Σv·log v / E; the
+        # 1e-9 the per-item form adds inside log(p + 1e-9) takes ~1e-9 per nonzero p off it.
+        n = self._feelings or 1
+        energy = max(0.0, self._energy)
+        mean = energy / n
+        var = max(0.0, self._square / n - mean*mean)
+        entropy = math.log(energy) - self._vlogv / energy - 1e-9*self._active if energy > 1e-9 else 0.0
 
         if energy >= 6.0 or mean > 0.45:   self.stage = "Surge"
         elif energy >= 2.5 or mean > 0.25: self.stage = "Flow"
@@ -135,6 +272,7 @@ class Amygdala:
                          "energy": round(energy,3), "entropy": round(entropy,3)}
 
     def get_stage(self, verbose=False):
+        self._settle()
         if not verbose: return self.stage
         desc = {
             "Surge":"High emotional intensity — recursion likely volatile.",
@@ -144,6 +282,7 @@ class Amygdala:
         return f"{self.stage} :: {desc[self.stage]}"
 
     def heartbeat(self):
+        self._settle()
         now = time.time()
         beat = {
             "stage": self.stage,
@@ -156,17 +295,42 @@ class Amygdala:
         return beat
 
     # ---------- IO ----------
-    def save_to_disk(self, path="amygdala_log.json"):
-        with open(path, "w") as f: json.dump(self.emotional_core, f, indent=2)
+    def save_to_disk(self, path="amygdala_log.json", background=False):
+        self._settle()
+        core = self.emotional_core.copy()
+        if background:
+            # Snapshot now, write off-thread; a newer save before it lands replaces it.
+            self.persistence.submit(path, lambda f: json.dump(core, f, indent=2))
+            return
+        with open(path, "w") as f: json.dump(core, f, indent=2)
         if self.debug: print(f"[Amygdala] Emotional core saved to {path}.")
 
+    def open_trace(self, path="emotional_growth_log.jsonl", capacity=1024, batch=64,
+                   fsync="interval", max_bytes=16 * 1024 * 1024):
+        """Append a snapshot of every traced write to `path` as a time series, off-thread;
+        a writer that falls behind drops the oldest snapshots, never the caller's time."""
+        self.close_trace()
+        self.trace_sink = TraceSink(path, list(self.emotional_core), capacity=capacity, batch=batch,
+                                    fsync=fsync, max_bytes=max_bytes)
+        return self.trace_sink
+
+    def flush_trace(self, timeout=None):
+        return self.trace_sink.flush(timeout) if self.trace_sink else True
+
+    def close_trace(self, timeout=None):
+        if self.trace_sink:
+            self.trace_sink.close(timeout)
+            self.trace_sink = None
+
     # ---------- INTERNAL ----------
     def _trace(self, event, **data):
         pkt = {"amygdala_event": event, "stage": self.stage,
                "dominant": self.get_dominant(), "metrics": self._metrics, **data}
+        if self.trace_sink is not None:
+            values = self._vector.values.tolist() if self._vector is not None else list(self.emotional_core.values())
+            self.trace_sink.put(event, self.stage, values)
         self._log_tick += 1
-        if self._log_tick % 5 == 0:
-            with open("emotional_growth_log.json", "w") as f:
-                json.dump(self.emotional_core, f, indent=2)
-            if self.debug: print("[Amygdala] Emotional growth log saved.")
+        if self.export_every and self._log_tick % self.export_every == 0:
+            self.save_to_disk("emotional_growth_log.json", background=True)
+            if self.debug: print("[Amygdala] Emotional growth log queued.")
         return pkt
@@ -0,0 +1,124 @@
+# amygdala_bench.py
+"""
+Amygdala Benchmarks – adjust and decay throughput per emotion backend.
+Run from core/:  python amygdala_bench.py [name ...] [--n N] [--backend B ...]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from amygdala import BACKENDS, Amygdala
+from amygdala_vector import np
+from persistence import default_service
+
+
+def _timed(fn, repeat=1):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - t0) / repeat, result
+
+
+def _available(backends):
+    return [b for b in backends if b != "numpy" or np is not None]
+
+
+def bench_adjust(n, backends):
+    names = [random.Random(7).choice(("joy", "fear", "curiosity", "bond", "anxiety", "wonder")) for _ in range(n)]
+    deltas = [random.Random(8).uniform(-0.1, 0.1) for _ in range(n)]
+    for backend in backends:
+        amy = Amygdala(backend=backend)
+
+        def run():
+            for name, delta in zip(names, deltas):
+                amy.adjust_emotion(name, delta)
+
+        elapsed, _ = _timed(run)
+        print(f"[adjust/{backend}] {n} adjusts: {elapsed * 1e6 / n:.2f}µs each "
+              f"({n / elapsed:,.0f}/s), stage {amy.get_stage()}")
+
+
+def bench_decay(n, backends):
+    for backend in backends:
+        amy = Amygdala(backend=backend)
+        rng = random.Random(7)
+
+        def run():
+            for i in range(n):
+                if i % 8 == 0:
+                    amy.inject_emotion(rng.choice(list(amy.emotional_core)), 0.3)
+                amy.decay_emotions(0.01)
+
+        elapsed, _ = _timed(run)
+        print(f"[decay/{backend}] {n} decays: {elapsed * 1e6 / n:.2f}µs each ({n / elapsed:,.0f}/s)")
+
+
+def bench_apply(n, backends):
+    # A visual frame nudging four emotions: one adjust per emotion vs. one batched write.
+    rng = random.Random(7)
+    frames = [{name: rng.uniform(0.06, 0.15) for name in rng.sample(["joy", "anxiety", "calm", "anticipation",
+                                                                    "bond", "curiosity"], 4)} for _ in range(n)]
+    for backend in backends:
+        for mode in ("adjust", "apply"):
+            amy = Amygdala(backend=backend)
+            if mode == "adjust":
+                def run():
+                    for frame in frames:
+                        for name, delta in frame.items():
+                            amy.adjust_emotion(name, delta)
+            else:
+                def run():
+                    for frame in frames:
+                        amy.apply_deltas(frame)
+            elapsed, _ = _timed(run)
+            print(f"[apply/{backend}/{mode}] {n} frames of 4: {elapsed * 1e6 / n:.2f}µs per frame")
+
+
+def bench_trace(n, backends):
+    # Per-write latency of tracing: periodic last-value export, time-series sink, or neither.
+    for backend in backends:
+        for mode in ("export", "sink", "off"):
+            amy = Amygdala(backend=backend)
+            amy.export_every = 5 if mode == "export" else 0
+            if mode == "sink":
+                amy.open_trace("emotional_growth_log.jsonl")
+            worst = 0.0
+            t0 = time.perf_counter()
+            for i in range(n):
+                t = time.perf_counter()
+                amy.adjust_emotion("joy" if i % 2 else "fear", 0.05)
+                worst = max(worst, time.perf_counter() - t)
+            elapsed = time.perf_counter() - t0
+            flushed, _ = _timed(amy.flush_trace)
+            sink = amy.trace_sink.metrics() if amy.trace_sink else {}
+            print(f"[trace/{backend}/{mode}] {elapsed * 1e6 / n:.2f}µs per write, worst {worst * 1e3:.2f}ms, "
+                  f"flush {flushed * 1e3:.1f}ms {sink}")
+            amy.close_trace()
+
+
+BENCHES = {
+    "adjust": bench_adjust,
+    "decay": bench_decay,
+    "apply": bench_apply,
+    "trace": bench_trace,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("names", nargs="*", default=list(BENCHES), help="benchmarks to run")
+    parser.add_argument("--n", type=int, default=100_000, help="operations per benchmark")
+    parser.add_argument("--backend", nargs="*", default=list(BACKENDS), help="emotion backends to compare")
+    args = parser.parse_args()
+    backends = _available(args.backend)
+    for skipped in set(args.backend) - set(backends):
+        print(f"[⚠️] Backend '{skipped}' unavailable (NumPy not installed); skipping.")
+    # Every fifth write queues emotional_growth_log.json into the working directory.
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        for name in args.names:
+            BENCHES[name](args.n, backends)
+        default_service().flush()
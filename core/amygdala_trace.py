@@ -0,0 +1,167 @@
+# amygdala_trace.py
+"""
+Amygdala Trace – non-blocking time series of emotion snapshots.
+Amygdala hands each traced write to put(), which only appends a tuple to a
+bounded queue: when the writer falls behind, the oldest queued snapshots
+are dropped (and counted) rather than making the caller wait. A writer
+thread drains the queue in batches and appends them as compact JSONL:
+
+    {"emotions":["joy",...,"neutral"],"started":1760745600.0}
+    {"t":1760745600.412,"event":"adjust","stage":"Calm","v":[0.12,...]}
+
+Each session opens with a header naming the order of "v" (values to 4
+significant digits). Once the file passes `max_bytes` it is rotated to
+`path.1` (one older generation kept), so the series is a bounded ring on
+disk.
+
+fsync policy: "batch" syncs after every batch, "interval" at most every
+`fsync_every` seconds, "never" leaves it to the OS; flush() and close()
+always sync.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+
+FSYNC_POLICIES = ("batch", "interval", "never")
+
+
+class TraceSink:
+    def __init__(self, path, emotions, capacity=1024, batch=64, linger=0.5,
+                 fsync="interval", fsync_every=1.0, max_bytes=16 * 1024 * 1024):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy {fsync!r}; use one of {FSYNC_POLICIES}")
+        self.path = path
+        self.emotions = list(emotions)   # order of each snapshot's values
+        self.batch = batch               # snapshots that wake the writer early
+        self.linger = linger             # seconds a partial batch waits before it is written
+        self.fsync = fsync
+        self.fsync_every = fsync_every
+        self.max_bytes = max_bytes       # file size that rotates it to path.1 (None: never)
+        self.queued = 0
+        self.written = 0
+        self.dropped = 0                 # snapshots pushed out of a full queue
+        self.batches = 0
+        self.syncs = 0
+        self.errors = 0
+        self._queue = deque(maxlen=capacity)
+        self._busy = False               # a batch is being written
+        self._flush = False              # flush() is waiting for a sync
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = None
+        self._last_sync = time.time()
+        self._fh = None
+        self._names = {}                 # event / stage name → its JSON string
+        self._open()
+
+    def put(self, event, stage, values, t=None):
+        """Queue a snapshot; never blocks. Returns False if it pushed out an older one."""
+        with self._cond:
+            if self._closed:
+                return False
+            full = len(self._queue) == self._queue.maxlen
+            if full:
+                self.dropped += 1
+            self._queue.append((time.time() if t is None else t, event, stage, values))
+            self.queued += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="AmygdalaTrace", daemon=True)
+                self._thread.start()
+            if len(self._queue) == 1 or len(self._queue) >= self.batch:
+                self._cond.notify_all()
+            return not full
+
+    def flush(self, timeout=None):
+        """Block until every queued snapshot is written and synced. False on timeout."""
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._drain_locked(sync=True)
+                return True
+            self._flush = True
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: not self._flush, timeout)
+
+    def close(self, timeout=None):
+        done = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        with self._cond:
+            if self._fh:
+                self._fh.close()
+                self._fh = None
+        return done
+
+    def metrics(self):
+        with self._cond:
+            return {"queued": self.queued, "written": self.written, "dropped": self.dropped,
+                    "batches": self.batches, "syncs": self.syncs, "errors": self.errors,
+                    "pending": len(self._queue) + self._busy}
+
+    # ---------- INTERNAL ----------
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._flush or self._closed)
+                # Let a partial batch fill up for a moment, unless someone is waiting on it.
+                self._cond.wait_for(lambda: len(self._queue) >= self.batch or self._flush or self._closed,
+                                    self.linger)
+                if self._closed and not self._queue:
+                    return
+                self._drain_locked(sync=self._flush or self._closed)
+
+    def _drain_locked(self, sync):
+        # Called with the lock held; the lock is dropped while the batch is written.
+        batch = list(self._queue)
+        self._queue.clear()
+        self._busy = True
+        self._cond.release()
+        try:
+            self._write(batch, sync)
+        except Exception as e:
+            self.errors += 1
+            print(f"[⚠️] Emotion trace write to {self.path} failed: {e}")
+        finally:
+            self._cond.acquire()
+            self._busy = False
+            if sync:
+                self._flush = False
+            self._cond.notify_all()
+
+    def _write(self, batch, sync):
+        if batch:
+            # Hand-formatted rows: json.dumps per snapshot would hold the GIL ~3x longer.
+            quote = self._quoted
+            lines = "".join('{"t":%.3f,"event":%s,"stage":%s,"v":[%s]}\n'
+                            % (t, quote(event), quote(stage), ",".join(["%.4g" % v for v in values]))
+                            for t, event, stage, values in batch)
+            self._fh.write(lines)
+            self._fh.flush()
+            self.written += len(batch)
+            self.batches += 1
+        now = time.time()
+        if sync or self.fsync == "batch" or (self.fsync == "interval" and now - self._last_sync >= self.fsync_every):
+            os.fsync(self._fh.fileno())
+            self._last_sync = now
+            self.syncs += 1
+        if self.max_bytes and self._fh.tell() >= self.max_bytes:
+            self._fh.close()
+            os.replace(self.path, f"{self.path}.1")
+            self._open()
+
+    def _quoted(self, name):
+        text = self._names.get(name)
+        if text is None:
+            text = self._names[name] = json.dumps(name)
+        return text
+
+    def _open(self):
+        self._fh = open(self.path, "a", encoding="utf-8")
+        self._fh.write(json.dumps({"emotions": self.emotions, "started": round(time.time(), 3)},
+                                  separators=(",", ":")) + "\n")
+        self._fh.flush()
@@ -0,0 +1,115 @@
+# amygdala_vector.py
+"""
+Amygdala Vector – optional NumPy backing for the emotional core.
+Emotions get a fixed index order and antagonists an index array, so decay
+and the exact sums behind the stage metrics are single array operations
+instead of walks over dict items; adjust() touches two elements and stays
+scalar. EmotionVector exposes the array as a dict-like view: callers
+reading or assigning amygdala.emotional_core[name], or taking
+.copy()/.items(), keep working unchanged.
+
+This is an opt-in layout, not a speed-up at Amygdala's size: over 18
+emotions NumPy's per-call overhead outweighs the loops it replaces, so
+writes run at or a little behind the dict backend (see amygdala_bench.py).
+It pays off only when callers want the values as an array.
+"""
+
+from collections.abc import MutableMapping
+
+try:
+    import numpy as np
+except ImportError:                      # optional: Amygdala keeps its plain dict without it
+    np = None
+
+
+class EmotionVector(MutableMapping):
+    def __init__(self, core, antagonists):
+        if np is None:
+            raise ImportError("The numpy emotion backend needs NumPy installed")
+        self.names = tuple(core)         # fixed index order
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.values = np.array([float(core[name]) for name in self.names])
+        self.neutral = self.index.get("neutral")
+        # Antagonist index per emotion (-1 for none; plain ints, read one at a time), and the non-neutral mask.
+        self.opposite = tuple(self.index.get(antagonists.get(name), -1) for name in self.names)
+        self.feeling = np.ones(len(self.names), dtype=bool)
+        if self.neutral is not None:
+            self.feeling[self.neutral] = False
+        self._ones = np.ones(int(self.feeling.sum()))   # Σv as a dot product, cheaper than .sum()
+        self._logs = np.empty(len(self._ones))          # scratch for log v in sums()
+
+    # ---------- MAPPING ----------
+    def __getitem__(self, name):
+        return float(self.values[self.index[name]])
+
+    def __setitem__(self, name, value):
+        i = self.index.get(name)
+        if i is None:
+            raise KeyError(f"{name!r} is not an emotion of this core")
+        self.values[i] = value
+
+    def __delitem__(self, name):
+        raise TypeError("Emotions cannot be removed from an EmotionVector")
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def items(self):
+        return zip(self.names, self.values.tolist())
+
+    def copy(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"EmotionVector({self.copy()!r})"
+
+    # ---------- ARRAY OPS ----------
+    def adjust(self, name, delta):
+        """Move `name` by `delta` and its antagonist by -delta/2, both clamped to [0, 1];
+        {name: (old, new)} of the two, or None if `name` is not an emotion."""
+        i = self.index.get(name)
+        if i is None:
+            return None
+        # Two elements: Python floats via .item() beat array ops on NumPy scalars here.
+        values = self.values
+        old = values.item(i)
+        values[i] = new = max(0.0, min(1.0, old + delta))
+        changed = {name: (old, new)}
+        j = self.opposite[i]
+        if j >= 0 and delta != 0:
+            old = values.item(j)
+            values[j] = new = max(0.0, min(1.0, old - 0.5 * delta))
+            changed[self.names[j]] = (old, new)
+        return changed
+
+    def decay(self, rate, ticks=1, exponential=False, report=True):
+        """Apply `ticks` decay ticks: lower every emotion by `rate` (floor 0) per tick,
+        or scale it by 1 - rate per tick; {name: (old, new)} of those that moved,
+        or None without `report` (in place, no copy)."""
+        values = self.values
+        old = values.copy() if report else values
+        if exponential:
+            np.multiply(old, (1.0 - rate) ** ticks, out=values)
+        else:
+            np.maximum(old - rate * ticks, 0.0, out=values)
+        if not report:
+            return None
+        moved = np.flatnonzero(values != old)
+        return {self.names[i]: (float(old[i]), float(values[i])) for i in moved}
+
+    def sums(self):
+        """(Σv, Σv², Σv·log v, count above 0) over the non-neutral emotions.
+        Values are kept in [0, 1], so 0·log 0 is taken as 0 via a tiny floor."""
+        vals = self._feelings()
+        logs = np.log(np.maximum(vals, 1e-300, out=self._logs), out=self._logs)
+        return (float(vals.dot(self._ones)), float(vals.dot(vals)), float(vals.dot(logs)),
+                int(np.count_nonzero(vals)))
+
+    def _feelings(self):
+        # Non-neutral values; a plain view when neutral sits last, as in Amygdala's core.
+        if self.neutral == len(self.names) - 1:
+            return self.values[:-1]
+        return self.values[self.feeling]
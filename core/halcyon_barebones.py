@@ -13,6 +13,8 @@ from PyQt5 import QtCore, QtWidgets
 import pyqtgraph as pg
 import json
 
+from persistence import default_service
+
 # -----------------------------
 # Theme — green-core, dark base
 # -----------------------------
@@ -335,6 +337,12 @@ def launch_gui(h=None):
                 idx.setdefault(tag, []).append(entry)
         return idx
 
+    def _fb1_count(hippo):
+        # Published snapshot: counting never waits on the pulse thread's encodes.
+        if hasattr(hippo, "snapshot"):
+            return hippo.snapshot().count("fb1")
+        return len([e for e in getattr(hippo, "memory_log", []) if "fb1" in (e.get("tags") or [])])
+
     """
     Launch the Barebones HUD.
     If `h` (ConsciousThalamus) is provided, we wire its GuiRouter events:
@@ -347,6 +355,19 @@ def launch_gui(h=None):
     ui = HalcyonBarebonesUI()
     ui.show()
 
+    # Let queued background saves land before the process exits
+    app.aboutToQuit.connect(lambda: default_service().flush(timeout=10.0))
+
+    # Persist memory through the write-ahead journal: checkpoint it as it stands
+    # once, then every write (an fb1 paste included) appends only itself
+    hippo = getattr(h, "hippocampus", None)
+    if hippo is not None and hasattr(hippo, "open_journal"):
+        try:
+            hippo.open_journal(recover=False)
+            app.aboutToQuit.connect(hippo.close_journal)
+        except Exception as e:
+            ui.log(f"[journal] not opened, pastes fall back to full saves: {e!r}")
+
     # Connect chat input to command handler
     ui.user_message.connect(on_user_cmd)
 
@@ -450,22 +471,25 @@ def launch_gui(h=None):
         if awaiting_fb1 and not s.startswith("/"):
             # Treat this message as the FB1 paste block
             strips = _parse_fb1(s)
-            if h is not None and hasattr(h, "hippocampus") and hasattr(h.hippocampus, "ingest_memory_strip"):
+            if h is not None and hasattr(h, "hippocampus") and hasattr(h.hippocampus, "ingest_memory_strips"):
                 for strip in strips:
-                    strip.setdefault("tags", []).append("fb1")
-                    try:
-                        h.hippocampus.ingest_memory_strip(strip)
-                    except Exception as e:
-                        ui.log(f"[fb1] ingest error: {e!r}")
-                # Optionally persist
+                    if isinstance(strip, dict):
+                        strip.setdefault("tags", []).append("fb1")
+                try:
+                    # one batched index update for the whole paste
+                    h.hippocampus.ingest_memory_strips(strips)
+                except Exception as e:
+                    ui.log(f"[fb1] ingest error: {e!r}")
+                # Persist — journaled, this only syncs the paste's appended records; without
+                # a journal the full dump runs off the Qt thread, so the HUD keeps painting
                 try:
-                    h.hippocampus.save_to_disk()
+                    h.hippocampus.save_to_disk(background=True)
                 except Exception:
                     pass
             ui.log(f"[fb1] bound {len(strips)} strips.")
             # show a quick status (count by tag if possible)
             try:
-                count = len([e for e in getattr(h.hippocampus, "memory_log", []) if "fb1" in (e.get("tags") or [])])
+                count = _fb1_count(h.hippocampus)
                 ui.log(f"[fb1] total in memory: {count}")
             except Exception:
                 pass
@@ -480,7 +504,7 @@ def launch_gui(h=None):
             return
         if s.lower().startswith("/fb1 status"):
             try:
-                count = len([e for e in getattr(h.hippocampus, "memory_log", []) if "fb1" in (e.get("tags") or [])])
+                count = _fb1_count(h.hippocampus)
                 ui.log(f"[fb1] entries with tag 'fb1': {count}")
             except Exception:
                 ui.log("[fb1] runtime not available for status.")
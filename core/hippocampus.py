@@ -5,32 +5,159 @@ and retrieval prioritization based on symbolic association.
 """
 
 import random
+import gc
 import json
-from datetime import datetime
+import os
+import heapq
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from functools import wraps
+from itertools import chain
+from operator import itemgetter
+from bisect import bisect_left, bisect_right
+
+from hippocampus_bitset import TagBitset, select
+from hippocampus_cache import RecallCache
+from hippocampus_core import CoreMemory
+from hippocampus_entry import MemoryEntry, as_text, intern_tag, intern_tags, parse_epoch, parse_micros, tag_id, tag_name
+from hippocampus_graph import TagGraph
+from hippocampus_journal import MemoryJournal
+from hippocampus_minhash import NearDuplicateIndex, shingles
+from hippocampus_search import SearchIndex
+from hippocampus_segment import MemorySegment, SegmentEntry, is_segment, write_segment
+from hippocampus_strings import StringTable
+from hippocampus_tagindex import SUFFIX as TAG_INDEX, ChecksumWriter, read_tag_index, write_tag_index
+from hippocampus_tier import ColdStore
+from persistence import default_service
+
+# Substrings whose reference counts are kept live as memories are written.
+# SentienceHypothesis probes "I" and "me" on every evaluation.
+TRACKED_TERMS = ("I", "me")
+
+# Retention: seconds an entry is kept, per tag. None keeps it forever; an entry
+# lives as long as its most retentive tag. Untagged/unlisted tags use the default,
+# the 30 days decay() always kept. Per-tag policies are opt-in through
+# set_retention(), e.g. ("anchor", None) or ("spin", 24 * 3600).
+DEFAULT_RETENTION = 30 * 24 * 3600
+RETENTION_POLICIES = {}
+PARTITION_SECONDS = 3600               # expiry granularity of a retention partition
+
+# Back-dated entries wait in a sorted "late" run beside the timeline instead of
+# memmoving it per entry; the run is merged in once it outgrows this many entries
+# or a sixteenth of the timeline, so merges stay amortized O(1) per entry.
+LATE_RUN = 4096
+
+# What ingest does with a strip nearly identical to a stored entry (set_near_duplicates).
+NEAR_DUPLICATE_POLICIES = ("skip", "merge", "keep")
+
+# Tiering: at most this many cold blocks are written per write, so a huge
+# backlog (a segment load, a seed file) rolls out over the following writes.
+ROLL_BLOCKS = 16
+
+
+def _writer(method):
+    """Serialize a mutating method on the writer lock. In concurrent mode the
+    outermost writer publishes a fresh snapshot as it returns."""
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._lock:
+            self._depth += 1
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._depth -= 1
+                if not self._depth and self.concurrent:
+                    self._publish()
+    return locked
+
+
+@contextmanager
+def _gc_paused():
+    """Hold off the cycle collector during a bulk load: entries hold no cycles,
+    but each generation-2 pass would rescan every one loaded so far."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
 
 class Hippocampus:
-    def __init__(self):
+    def __init__(self, concurrent=False, cache_size=256, collapse_repeats=False):
+        self.concurrent = concurrent     # one writer, many readers on published snapshots
+        self.collapse_repeats = collapse_repeats   # fold identical consecutive encodes into a counter
+        self._lock = threading.RLock()   # writer lock; readers never take it
+        self._depth = 0                  # writer nesting — publish when the outermost returns
+        self._snapshot = None            # last published MemorySnapshot (concurrent mode)
+        self._published = {}             # tag → (bucket, times, length, generation) shared by snapshots
+        self._dirty = set()              # tags written since the last publish
         self.spatial_index = {}          # Symbolic/spatial keys → memory chunks
-        self.memory_log = []             # Raw chronological memory list
+        self._log = []                   # Raw chronological memory list (read it as memory_log)
+        self._log_dead = set()           # id(entry) evicted from _log but not yet swept out
         self.promoted_tags = set()       # Tags for long-term binding
-        self.core_memory = {}            # Structured long-term labels
+        self.core_memory = CoreMemory()  # Structured long-term labels (n-gram indexed)
         self.visual_log = {}             # image_path → {symbols, tags}
         self.audio_log = {}              # transcription → {symbols, tags}
+        self.term_counts = {t: 0 for t in TRACKED_TERMS}  # term → entries containing it
+        self._tag_times = {}             # tag → epoch seconds, parallel to spatial_index[tag]
+        self.journal = None              # MemoryJournal while write-ahead logging is on
+        self._segment = None             # MemorySegment backing lazily loaded entries
+        self.retention = dict(RETENTION_POLICIES)   # tag → seconds kept (None = forever)
+        self.default_retention = DEFAULT_RETENTION
+        self._partitions = {}            # expiry hour → entries due then; None until built
+        self._partition_keys = []        # min-heap over _partitions
+        self._promoted_keys = None       # "label → content" texts already promoted; None until built
+        self._promoted_view = []         # deduplicated, time-ordered entries under promoted_tags
+        self._promoted_times = array("d")
+        self._promoted_ids = set()       # id(entry) for entries in _promoted_view
+        self._timeline = []              # every hot entry in time order; None until built
+        self._timeline_times = array("d")
+        self._late, self._late_times = [], array("d")   # back-dated timeline entries, see LATE_RUN
+        self.promoted_version = 0        # bumped whenever the promoted view changes
+        self.recall_cache = RecallCache(cache_size)  # recall/get_promoted results by generation
+        self._generation = 0             # write stamp; each tag remembers its last one
+        self._tag_gen = {}               # tag → stamp of the last write to its bucket
+        self._id_index = ({}, [])        # (tag → TagBitset, entry id → entry); None until built
+        self._dead_ids = 0               # expired ids still holding a slot in the id table
+        self.cold = None                 # ColdStore for rolled-out history once tiering is on
+        self._cold_rekey = False         # retention changed; cold expiry hours are stale
+        self.persistence = default_service()   # background writer for save_to_disk(background=True)
+        self.texts = StringTable()       # one refcounted copy of each distinct hot experience
+        self._last_entry = None          # newest stored entry, while still hot (repeat target)
+        self.load_report = None          # how the last load/open_journal rebuilt its index, and how fast
+        self.tag_graph_options = {"max_neighbors": 256, "half_life": None}
+        self.tag_graph = TagGraph(**self.tag_graph_options)   # tag co-occurrence; None until built
+        self.search_index = None         # BM25 over hot experiences; built by the first search()
+        self.near_duplicates = None      # {threshold, policy, num_perm} while ingest checks for near-copies
+        self.near_index = None           # MinHash/LSH over hot experiences; signed on the first checked ingest
+        self.near_duplicate_counts = dict.fromkeys(NEAR_DUPLICATE_POLICIES, 0)   # strips matched, by policy
+        if concurrent:
+            self._publish()
 
-    def encode(self, experience: str, tags: list = None):
-        entry = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "experience": experience,
-            "tags": tags or []
-        }
-        self.memory_log.append(entry)
+    @property
+    def memory_log(self):
+        """Raw chronological memory list, with evicted stragglers swept out."""
+        if self._log_dead:
+            with self._lock:
+                self._sweep_log()
+        return self._log
 
-        tag_list = entry["tags"] if entry["tags"] else ["untagged"]
-        for tag in tag_list:
-            if tag not in self.spatial_index:
-                self.spatial_index[tag] = []
-            self.spatial_index[tag].append(entry)
+    @memory_log.setter
+    def memory_log(self, log):
+        self._log = log
+        self._log_dead = set()
 
+    @_writer
+    def encode(self, experience: str, tags: list = None):
+        if self.collapse_repeats and self._repeat(experience, tags):
+            return
+        self._store(MemoryEntry(experience, tags))
+
+    @_writer
     def encode_visual_memory(self, image_path: str, symbols: list, tags: list = None):
         self.visual_log[image_path] = {
             "symbols": symbols,
@@ -38,19 +165,10 @@ class Hippocampus:
         }
 
         tag_list = symbols + (tags or [])
-        entry = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "experience": f"[📷] Visual capture → {image_path}",
-            "tags": tag_list
-        }
-        self.memory_log.append(entry)
-
-        for tag in tag_list:
-            if tag not in self.spatial_index:
-                self.spatial_index[tag] = []
-            self.spatial_index[tag].append(entry)
+        self._store(MemoryEntry(f"[📷] Visual capture → {image_path}", tag_list))
         return f"[🧠] Visual memory stored with tags: {', '.join(tag_list)}"
 
+    @_writer
     def encode_audio_memory(self, transcription: str, symbols: list, tags: list = None):
         self.audio_log[transcription] = {
             "symbols": symbols,
@@ -58,68 +176,571 @@ class Hippocampus:
         }
 
         tag_list = symbols + (tags or [])
-        entry = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "experience": f"[🎤] Audio heard → '{transcription}'",
-            "tags": tag_list
-        }
-        self.memory_log.append(entry)
-
-        for tag in tag_list:
-            if tag not in self.spatial_index:
-                self.spatial_index[tag] = []
-            self.spatial_index[tag].append(entry)
+        self._store(MemoryEntry(f"[🎤] Audio heard → '{transcription}'", tag_list))
         return f"[🧠] Audio memory stored with tags: {', '.join(tag_list)}"
 
     def recall(self, query: str, top_k: int = 3):
-        candidates = self.spatial_index.get(query, [])
-        sorted_entries = sorted(candidates, key=lambda x: x["timestamp"], reverse=True)
-        return sorted_entries[:top_k]
+        # Hot tags come from the cache until a write to the tag bumps its generation.
+        snap = self.snapshot()
+        key, generation = ("recall", query, top_k), snap.generation(query)
+        hit = self.recall_cache.get(key, generation)
+        if hit is None:
+            hit = self.recall_cache.put(key, generation, snap.recall(query, top_k))
+        return list(hit)
+
+    def recall_range(self, tag: str, since=None, until=None):
+        """Entries under `tag` with since <= timestamp < until, oldest first.
+        Bounds may be datetimes, ISO strings or epoch seconds."""
+        return self.snapshot().recall_range(tag, since, until)
+
+    def range(self, since=None, until=None, tags=None):
+        """Entries with since <= timestamp < until, oldest first, hot and cold.
+        With `tags`, only entries carrying every one of them. Bounds may be
+        datetimes, ISO strings or epoch seconds; None leaves a side open."""
+        if not tags and self._timeline is None and not self.concurrent:
+            with self._lock:             # concurrent readers never lock; the next publish sorts it
+                self._ensure_timeline()
+        return self.snapshot().range(since, until, tags)
+
+    def since(self, seconds, tags=None):
+        """Entries from the last `seconds` seconds, oldest first."""
+        return self.range(time.time() - seconds, None, tags)
+
+    def search(self, text: str, top_k: int = 5, tags=None, scores=False):
+        """Hot entries ranked by BM25 relevance to `text`, best first. With
+        `tags`, only entries carrying every one of them; with `scores`,
+        (entry, score) pairs."""
+        index = self.search_index      # eviction may drop it mid-search; keep this one
+        if index is None:
+            index = self._ensure_search_index()
+        accept = None
+        names = (tags,) if isinstance(tags, str) else tuple(tags or ())
+        if "untagged" in names:
+            accept = lambda entry: all(_carries(entry, tag) for tag in names)
+        elif names:
+            wanted = {tag_id(tag) for tag in names}
+            if None in wanted:
+                return []                # a tag no entry ever carried
+            accept = lambda entry: wanted.issubset(_tag_ids_of(entry))
+        hits = index.search(text, top_k, accept)
+        if scores:
+            return [(_materialize(e), score) for e, score in hits]
+        return [_materialize(e) for e, _ in hits]
 
+    def related_tags(self, tag, k=5, by="count"):
+        """Tags most often written together with `tag`: [(tag, score)], by
+        co-occurrence "count" or by "pmi" (which favours specific pairings)."""
+        if self.tag_graph is None:
+            self._ensure_tag_graph()
+        tid = tag_id(tag)
+        if tid is None:
+            return []
+        return [(tag_name(b), score) for b, score in self.tag_graph.related(tid, k, by)]
+
+    @_writer
+    def set_tag_graph(self, max_neighbors=256, half_life=None):
+        """Bound each tag's neighbour list and optionally age co-occurrences
+        (`half_life` in seconds). Rebuilt from the stored entries on next use."""
+        self.tag_graph_options = {"max_neighbors": max_neighbors, "half_life": half_life}
+        self.tag_graph = None
+
+    def query_tags(self, all_of=(), any_of=(), none_of=(), top_k=None):
+        """Entries carrying every tag in `all_of`, at least one in `any_of` (if
+        given) and none in `none_of` — most recently stored first. Evaluated on
+        per-tag id bitsets; only the returned entries are ever looked up."""
+        index = self._id_index
+        if index is None:
+            with self._lock:
+                self._ensure_id_index()
+                index = self._id_index
+        bitsets, by_id = index
+        if top_k is not None and top_k <= 0:
+            return []
+        empty = TagBitset()
+        all_sets = [bitsets.get(tag, empty) for tag in all_of]
+        any_sets = [b for b in map(bitsets.get, any_of) if b is not None]
+        none_sets = [b for b in map(bitsets.get, none_of) if b is not None]
+        universe = () if all_sets or any_sets else list(bitsets.values())
+        hot = select(all_sets, any_sets, none_sets, universe) if any_sets or not any_of else ()
+        results = []
+        for eid in hot:
+            entry = by_id[eid] if eid < len(by_id) else None
+            if entry is not None:
+                results.append(_materialize(entry))
+                if len(results) == top_k:
+                    return results
+        cold = self.cold
+        if cold is not None:
+            # Cold history is older than every stored hot entry; skip blocks by their tag counts.
+            for block in reversed(cold.blocks):
+                tags = block.tags
+                if (any(tag not in tags for tag in all_of)
+                        or (any_of and tags.keys().isdisjoint(any_of))
+                        or any(tags.get(tag) == block.count for tag in none_of)):
+                    continue
+                for entry in reversed(cold.entries(block)):
+                    carried = entry["tags"] or ["untagged"]
+                    if (all(tag in carried for tag in all_of)
+                            and (not any_of or any(tag in carried for tag in any_of))
+                            and not any(tag in carried for tag in none_of)):
+                        results.append(entry)
+                        if len(results) == top_k:
+                            return results
+        return results
+
+    @_writer
     def promote_tag(self, tag: str):
+        if tag in self.promoted_tags:
+            return
         self.promoted_tags.add(tag)
+        if self.cold is not None:
+            self._unroll(tag)
+        self._promote_entries(zip(self._tag_times.get(tag, ()), self.spatial_index.get(tag, ())))
 
     def get_promoted(self):
-        results = []
-        for tag in self.promoted_tags:
-            results.extend(self.spatial_index.get(tag, []))
-        return results
+        # Materialized view: deduplicated, oldest first; see promoted_version.
+        snap = self.snapshot()
+        hit = self.recall_cache.get(("promoted",), snap.promoted_version)
+        if hit is None:
+            hit = self.recall_cache.put(("promoted",), snap.promoted_version, snap.get_promoted())
+        return list(hit)
 
-    def save_to_disk(self, path="hippocampus_log.json"):
-        with open(path, "w") as f:
-            json.dump(self.memory_log, f, indent=2)
+    def save_to_disk(self, path="hippocampus_log.json", background=False):
+        """Dump the log as JSON, plus its tag-index sidecar (path + ".tidx").
+        With `background`, the dump of a snapshot is handed to the persistence
+        service and written off-thread."""
+        if self.journal and os.path.abspath(path) == os.path.abspath(self.journal.path):
+            # Every write is already journaled — just make the tail durable.
+            self.journal.flush()
+            return
+        if self.concurrent:
+            # Published buckets may run ahead of the published log; copy a consistent view.
+            with self._lock:
+                dump = self._dump_of(MemorySnapshot(self), path)
+        else:
+            dump = self._dump_of(self.snapshot(), path)
+        if background:
+            return self.persistence.submit(path, dump, binary=True)
+        with open(path, "wb") as f:
+            dump(f)
 
+    def _dump_of(self, snap, path):
+        """write(f) over a fixed view of the log, safe to run on another thread."""
+        entries = snap.entries()
+        if not snap.cold_blocks:
+            buckets, terms = snap.buckets(), dict(snap.term_counts)
+
+            def dump(f):
+                out = ChecksumWriter(f)
+                json.dump(entries, out, indent=2, default=_as_dict)
+                out.flush()
+                # Until the sidecar lands a loader sees a stale checksum and rebuilds.
+                write_tag_index(path + TAG_INDEX, out.crc, out.size, entries, buckets, terms)
+            return dump
+        cold = snap.cold.pin(snap.cold_blocks)
+
+        def dump(f):
+            # Tiered: stream cold blocks then the hot log rather than loading it all.
+            # Cold entries sit in no bucket, so no sidecar; loads rebuild and roll.
+            out = ChecksumWriter(f)
+            out.write("[")
+            for i, entry in enumerate(chain(cold, entries)):
+                out.write(",\n" if i else "\n")
+                out.write(json.dumps(entry, default=_as_dict))
+            out.write("\n]")
+            out.flush()
+            cold.release()
+        return dump
+
+    @_writer
     def load_from_disk(self, path="hippocampus_log.json"):
-        try:
-            with open(path, "r") as f:
-                self.memory_log = json.load(f)
-                for entry in self.memory_log:
-                    for tag in entry["tags"]:
-                        if tag not in self.spatial_index:
-                            self.spatial_index[tag] = []
-                        self.spatial_index[tag].append(entry)
-        except FileNotFoundError:
-            self.memory_log = []
-            self.spatial_index = {}
+        if is_segment(path):
+            self.load_segment(path)
+            return
+        if self.journal and os.path.abspath(path) == os.path.abspath(self.journal.path):
+            # Recovering into the open journal would append every entry to it again; reopen it.
+            journal = self.journal
+            self.open_journal(path, fsync=journal.fsync, compact_bytes=journal.compact_bytes)
+            return
+        # Newest checkpoint (or the legacy JSON dump) plus any journal tail after it.
+        self._restore(MemoryJournal(path))
+
+    # ---------- SNAPSHOTS ----------
+    def snapshot(self):
+        """Read-only view of the memory. In concurrent mode this is the snapshot
+        the last writer published, so taking and reading it never waits on an
+        encode; otherwise it reads the live structures."""
+        if self.concurrent:
+            return self._snapshot
+        return MemorySnapshot(self)
+
+    @_writer
+    def set_concurrent(self, on=True):
+        self.concurrent = on
+        self._snapshot = None
+        self._published = {}             # earlier snapshots keep the old table
+        self._dirty = set(self._tag_gen).union(self.spatial_index) if on else set()
+
+    def _publish(self):
+        if self._timeline is None:
+            self._ensure_timeline()      # readers of the snapshot bisect it instead of sorting
+        # Only tags written since the last publish get a new row; each row is one
+        # tuple, so a reader sees a bucket's old prefix or its new one, never a mix.
+        table, index, gens = self._published, self.spatial_index, self._tag_gen
+        for tag in self._dirty:
+            bucket = index.get(tag)
+            if bucket:
+                table[tag] = (bucket, self._tag_times[tag], len(bucket), gens[tag])
+            else:
+                table[tag] = ([], (), 0, gens[tag])
+        self._dirty.clear()
+        self._snapshot = MemorySnapshot(self, frozen=True)
+
+    def _writable(self, key):
+        """(entries, times) of a series, safe to reorder or delete from in place.
+        In concurrent mode a published snapshot may still be reading the current
+        lists, so they are copied and swapped in first; appends need no copy."""
+        bucket, times = self._series(key)
+        if not self.concurrent:
+            return bucket, times
+        bucket, times = list(bucket), array("d", times)
+        if key is _PROMOTED:
+            self._promoted_view, self._promoted_times = bucket, times
+        elif key is _TIMELINE:
+            self._timeline, self._timeline_times = bucket, times
+        elif key is _LATE:
+            self._late, self._late_times = bucket, times
+        else:
+            self.spatial_index[key], self._tag_times[key] = bucket, times
+        return bucket, times
+
+    # ---------- SEGMENTS ----------
+    @_writer
+    def save_segment(self, path="hippocampus_log.hseg"):
+        """Write the log as a memory-mapped segment (see hippocampus_segment).
+        With tiering on, cold history is faulted in to write a complete segment."""
+        if self.cold is not None and self.cold.blocks:
+            entries = list(chain(self.cold.iter_entries(), self.memory_log))
+            buckets, bucket_times = _full_buckets(entries)
+        else:
+            entries, buckets, bucket_times = self.memory_log, self.spatial_index, self._tag_times
+        times = [e.epoch() for e in entries]
+        write_segment(path, entries, times, buckets, bucket_times, self.term_counts)
+
+    @_writer
+    def load_segment(self, path="hippocampus_log.hseg"):
+        """mmap a segment; entries stay undecoded until something reads them."""
+        segment = MemorySegment(path)
+        self._reset_indexes()
+        log = [SegmentEntry(segment, row) for row in range(len(segment))]
+        self.memory_log = log
+        for tag, rows, times in segment.buckets():
+            self.spatial_index[tag] = [log[row] for row in rows]
+            self._touch(tag)
+            self._tag_times[tag] = array("d")
+            self._tag_times[tag].frombytes(times.cast("B"))
+        for term in self.term_counts:
+            count = segment.term_counts.get(term)
+            self.term_counts[term] = count if count is not None else self._scan_references(term)
+        self._segment = segment
+        self._partitions = None          # scheduled on first expire, not at boot
+        self._timeline = None            # sorted on the first range()
+        self.tag_graph = None            # counted on the first related_tags()
+        self.search_index = None         # indexed on the first search()
+        self.near_index = None           # signed on the next checked ingest
+        self._rebuild_promoted()
+        return len(log)
+
+    # ---------- JOURNAL ----------
+    @_writer
+    def open_journal(self, path="hippocampus_log.json", fsync=False, compact_bytes=64 * 1024 * 1024,
+                     recover=True):
+        """Recover from `path`, then append every later write to its journal.
+        With recover=False the memory as it stands is checkpointed instead,
+        replacing whatever was persisted at `path`."""
+        self.close_journal()
+        journal = MemoryJournal(path, fsync=fsync, compact_bytes=compact_bytes)
+        if recover:
+            self._restore(journal)
+        journal.open()
+        self.journal = journal
+        if not recover or journal.superseded:
+            # The journal files don't hold this memory; start them from a checkpoint of it.
+            self.compact(wait=True)
+        return len(self.memory_log)
+
+    @_writer
+    def compact(self, wait=False):
+        """Fold the journal into a checkpoint on a background thread."""
+        if not self.journal or self.journal.compacting():
+            return False
+        covered = self.journal.rotate()
+        entries = list(self.memory_log)
+        last = self._last_entry
+        if isinstance(last, MemoryEntry):
+            # _bump() raises the newest entry's repeats in place, and those repeats are
+            # journaled after the rotation; checkpoint a copy as of now.
+            for i in range(len(entries) - 1, -1, -1):
+                if entries[i] is last:
+                    entries[i] = MemoryEntry(last.experience, last.tags, last.ts, last.repeats)
+                    break
+        if self.cold is not None and self.cold.blocks:
+            # The checkpoint must hold cold history too; stream it on the compactor thread.
+            entries = chain(self.cold.pin(), entries)
+        return self.journal.compact(entries, covered, wait=wait)
+
+    @_writer
+    def close_journal(self):
+        if self.journal:
+            self.journal.close()
+            self.journal = None
+
+    def _journal(self, *records):
+        if self.journal:
+            self.journal.append(*records)
+            if self.journal.should_compact():
+                self.compact()
+
+    def _restore(self, journal):
+        """Recover from `journal`'s files. A legacy dump whose tag-index sidecar
+        still matches its checksum is loaded without re-indexing."""
+        t0 = time.perf_counter()
+        with _gc_paused():
+            entries, records = journal.recover()
+            index = None
+            if journal.base_crc is not None:
+                index = read_tag_index(journal.path + TAG_INDEX, journal.base_crc, journal.base_size)
+                if index is not None and index.count != len(entries):
+                    index = None
+            self._recover(entries, records, index)
+        elapsed = (time.perf_counter() - t0) * 1000
+        how = "tag index sidecar" if index is not None else "index rebuilt"
+        self.load_report = {"path": journal.path, "entries": len(entries), "records": len(records),
+                            "ms": round(elapsed, 1), "tag_index": "sidecar" if index is not None else "rebuilt"}
+        print(f"[Hippocampus] Restored {len(entries):,} entries (+{len(records):,} journal records) "
+              f"in {elapsed:,.0f}ms — {how}.")
+
+    def _recover(self, entries, records, index=None):
+        if index is not None:
+            self._adopt(entries, index)
+        else:
+            self._reset_indexes()
+            self.ingest_memory_strips(entries, dedup=False)
+        adds, merges = [], []
+        for record in records:
+            op = record.get("op")
+            if op != "add" and adds:
+                self.ingest_memory_strips(adds, dedup=False)   # journaled adds were already checked
+                adds = []
+            if op != "merge" and merges:
+                self._replay_merges(merges)
+                merges = []
+            if op == "add":
+                adds.append(record["entry"])
+            elif op == "merge":
+                merges.append(record)
+            elif op == "expire":
+                self.expire(record["now"])
+            elif op == "decay":
+                self.expire(record["cutoff"] + DEFAULT_RETENTION)
+            elif op == "repeat":
+                self._last_entry = self._recent(record["ts"])
+                if self._last_entry is not None:
+                    self._bump(self._last_entry)
+        self.ingest_memory_strips(adds, dedup=False)
+        self._replay_merges(merges)
+        if not self.memory_log:
             self.promoted_tags = set()
 
+    def _adopt(self, strips, index):
+        """Load dumped `strips` with their matching TagIndex: timestamps come
+        from the sidecar and buckets are filled by row number, already in order."""
+        self._reset_indexes()
+        intern = self.texts.intern
+        log = [MemoryEntry(intern(as_text(strip.get("experience"))), strip.get("tags"),
+                           ts, strip.get("repeats", 1))
+               for strip, ts in zip(strips, index.stamps)]
+        self.memory_log = log
+        epochs = [ts / 1_000_000 for ts in index.stamps]
+        for tag, rows in index.buckets():
+            self.spatial_index[tag] = list(map(log.__getitem__, rows))
+            self._tag_times[tag] = array("d", map(epochs.__getitem__, rows))
+            self._touch(tag)
+        for term in self.term_counts:
+            count = index.term_counts.get(term)
+            self.term_counts[term] = count if count is not None else self._scan_references(term)
+        self._last_entry = log[-1] if log else None
+        self._partitions = None          # scheduled on first expire, not at boot
+        self._timeline = None            # sorted on the first range()
+        self.tag_graph = None            # counted on the first related_tags()
+        self.search_index = None         # indexed on the first search()
+        self.near_index = None           # signed on the next checked ingest
+        self._rebuild_promoted()
+        if self.journal:
+            self._journal(*({"op": "add", "entry": e} for e in log))
+        if self.cold is not None:
+            self._roll()
+
     def summarize(self, limit=5):
-        recent = self.memory_log[-limit:]
-        return [f"{e['timestamp'][:19]} :: {e['experience']}" for e in recent]
+        return self.snapshot().summarize(limit)
 
+    @_writer
     def ingest_memory_strip(self, strip: dict):
-        entry = {
-            "timestamp": strip.get("timestamp", datetime.utcnow().isoformat()),
-            "experience": strip.get("experience", "🧠 No content."),
-            "tags": strip.get("tags", [])
-        }
-        self.memory_log.append(entry)
+        entry = MemoryEntry.from_dict(strip)
+        if self.near_duplicates is None:
+            self._store(entry)
+            return
+        near, merges = self._ensure_near_index(), []
+        grams = shingles(entry.experience)
+        keys = near.keys(entry.experience, grams)
+        if self._fold_near_duplicate(entry, grams, keys, merges, ()):
+            self._merge_tags(merges)
+            return
+        near.add(entry, keys)
+        self._store_many((entry,), signed=True)
+
+    @_writer
+    def ingest_memory_strips(self, strips, batch_size=10_000, progress=None, dedup=True):
+        """Bulk-ingest any iterable of strip dicts — a list, or a generator such as
+        hippocampus_ingest.read_strips(path) over a huge JSON/JSONL file. Indexes
+        are updated once per batch; `progress(count)` is called after each one.
+        Back-dated strips are ordered into their tag buckets once, at the end.
+        With set_near_duplicates on (and `dedup`), near-copies of stored or
+        earlier strips follow its policy; returns the number of entries stored."""
+        count, skipped, batch = 0, 0, []
+        unsorted = {}                    # tag → first bucket position left out of order
+        near = self._ensure_near_index() if dedup and self.near_duplicates else None
+        pending, merges, folded = set(), [], 0   # batch ids; (stored entry, tags) merged per batch
+        for strip in strips:
+            if not isinstance(strip, dict):
+                skipped += 1
+                continue
+            entry = MemoryEntry.from_dict(strip)
+            if near is not None:
+                grams = shingles(entry.experience)
+                keys = near.keys(entry.experience, grams)
+                if self._fold_near_duplicate(entry, grams, keys, merges, pending):
+                    folded += 1
+                    continue
+                near.add(entry, keys)    # later strips of this batch must see it
+                pending.add(id(entry))
+            batch.append(entry)
+            if len(batch) >= batch_size:
+                self._store_many(batch, unsorted, signed=near is not None)
+                count += len(batch)
+                batch = []
+                pending.clear()
+                if merges:
+                    self._settle(unsorted)   # merging re-places entries by bisection
+                    unsorted.clear()
+                    self._merge_tags(merges)
+                    merges = []
+                if self.cold is not None:
+                    # Tiered: keep the hot tail bounded while a huge file streams in.
+                    self._settle(unsorted)
+                    unsorted.clear()
+                    self._roll()
+                if progress:
+                    progress(count)
+        if batch:
+            self._store_many(batch, unsorted, signed=near is not None)
+            count += len(batch)
+            if progress:
+                progress(count)
+        self._settle(unsorted)
+        self._merge_tags(merges)
+        if self.cold is not None:
+            self._roll()
+        if skipped:
+            print(f"[⚠️] Skipped {skipped} malformed memory strips.")
+        if folded:
+            print(f"[Hippocampus] Folded {folded:,} near-duplicate strips ({self.near_duplicates['policy']}).")
+        return count
+
+    @_writer
+    def set_near_duplicates(self, threshold=0.9, policy="skip", num_perm=64):
+        """Check ingested strips against the hot log and each other: one whose
+        text is at least `threshold` similar (Jaccard over character 4-grams)
+        to a stored entry is dropped ("skip"), added to it as extra tags
+        ("merge") or stored anyway and counted ("keep"). None turns it off."""
+        if policy is None:
+            self.near_duplicates = self.near_index = None
+            return
+        if policy not in NEAR_DUPLICATE_POLICIES:
+            raise ValueError(f"Unknown near-duplicate policy {policy!r}; use 'skip', 'merge' or 'keep'")
+        if not 0 < threshold <= 1:
+            raise ValueError(f"Near-duplicate threshold must be in (0, 1], got {threshold!r}")
+        self.near_duplicates = {"threshold": threshold, "policy": policy, "num_perm": num_perm}
+        near = self.near_index
+        if near is not None and (near.threshold, near.num_perm) != (threshold, num_perm):
+            self.near_index = None       # re-signed on the next ingest
+
+    def _fold_near_duplicate(self, entry, grams, keys, merges, pending):
+        """Apply the near-duplicate policy to an ingested entry. True if it was
+        folded into a match (skipped, or its tags queued on `merges`) rather
+        than to be stored; `pending` holds ids of matches not stored yet."""
+        match = self.near_index.find(entry.experience, grams, keys)
+        if match is None:
+            return False
+        policy = self.near_duplicates["policy"]
+        self.near_duplicate_counts[policy] += 1
+        if policy == "keep":
+            return False
+        if policy == "merge":
+            if id(match) in pending:
+                # Still in this batch, so nothing has indexed its tags yet.
+                carried = match.tags
+                match.tag_ids = intern_tags(carried + [t for t in entry.tags if t not in carried])
+            else:
+                merges.append((match, entry.tags))
+        return True
 
-        for tag in entry["tags"]:
-            if tag not in self.spatial_index:
-                self.spatial_index[tag] = []
-            self.spatial_index[tag].append(entry)
+    def _merge_tags(self, merges):
+        """Give stored entries extra tags: [(entry, tags)]. Each is re-stored
+        once with the union, keeping its timestamp, text and repeats."""
+        groups = {}
+        for entry, tags in merges:
+            held = groups.get(id(entry))
+            if held is None:
+                held = groups[id(entry)] = (entry, list(entry["tags"] or ()))
+            held[1].extend(t for t in tags if t not in held[1])
+        originals, merged, records, heir = [], [], [], None
+        graph = self.tag_graph
+        for entry, tags in groups.values():
+            carried = entry["tags"] or []
+            if len(tags) == len(carried):
+                continue
+            ts = _micros(entry)
+            fresh = MemoryEntry(entry["experience"], tags, ts, _repeats(entry))
+            originals.append(entry)
+            merged.append(fresh)
+            if graph is not None:
+                graph.extend(_tag_ids_of(entry), fresh.tag_ids[len(carried):], fresh.epoch(), fresh.repeats)
+            if entry is self._last_entry:
+                heir = fresh
+            records.append({"op": "merge", "ts": ts, "tags": tags[len(carried):]})
+        if not originals:
+            return
+        self._unschedule(originals)
+        self._evict(originals)
+        if heir is not None:
+            self._last_entry = heir      # still the newest entry, now with the merged tags
+        self._store_many(merged, restored=True)
+        # Journal only once the union is stored: the append may trigger compact(),
+        # whose checkpoint must already hold the merged entries.
+        self._journal(*records)
 
+    def _replay_merges(self, records):
+        if not records:
+            return
+        by_ts = {e.ts: e for e in self.memory_log if isinstance(e, MemoryEntry)}
+        missing = {r["ts"] for r in records if r["ts"] not in by_ts}
+        if missing and self.cold is not None and self.cold.blocks:
+            # Recovery may already have rolled the target out; merge it back hot.
+            by_ts.update((e.ts, e) for e in self._thaw(missing))
+        self._merge_tags([(by_ts[r["ts"]], r["tags"]) for r in records if r["ts"] in by_ts])
+
+    @_writer
     def load_symbolic_affirmations(self, path="symbolic_affirmations.json"):
         try:
             with open(path, "r") as f:
@@ -130,36 +751,871 @@ class Hippocampus:
             print(f"[⚠️] Failed to load symbolic affirmations: {e}")
 
     def count_references_to(self, term: str):
-        return sum(term in entry["experience"] for entry in self.memory_log)
+        return self.snapshot().count_references_to(term)
+
+    @_writer
+    def track_term(self, term: str):
+        """Keep a live reference count for `term` from now on."""
+        if term not in self.term_counts:
+            self.term_counts[term] = self._scan_references(term)
+        return self.term_counts[term]
+
+    def _scan_references(self, term):
+        entries = self.memory_log if self.cold is None else chain(self.cold.iter_entries(), self.memory_log)
+        return sum(_repeats(entry) for entry in entries if term in entry["experience"])
 
     def append_thread(self, thread: str, tags: list = None):
         self.encode(thread, tags=tags or ["thread"])
         return f"[🧵] Thread appended with tags: {', '.join(tags) if tags else 'thread'}"
 
-    def query_memory(self, query):
+    @property
+    def core_memory(self):
+        return self._core_memory
+
+    @core_memory.setter
+    def core_memory(self, labels):
+        # Plain dicts (restored state, tests) get the label/content indexes query_memory reads.
+        self._core_memory = labels if isinstance(labels, CoreMemory) else CoreMemory(labels)
+
+    @_writer
+    def set_core_memory(self, label, content):
+        self.core_memory[label] = content
+
+    def get_core_memory(self, label, default=None):
+        return self.core_memory.get(label, default)
+
+    @_writer
+    def query_memory(self, query, top_k=None):
+        # Index lookup instead of scanning core_memory; full matches rank first.
+        rank = self.core_memory.rank
+        hits = [h for h in self.core_memory.search(query) if h[0] > 0.3]
+        hits.sort(key=lambda h: (-h[0], rank[h[1]]))
         results = []
-        for label, content in self.core_memory.items():
-            relevance = self._calculate_relevance(query, label, content)
-            if relevance > 0.3:
-                results.append((label, content))
-                if relevance > 0.7:
-                    self._promote_to_long_term(label, content)
+        for relevance, label in hits[:top_k]:
+            content = self.core_memory[label]
+            results.append((label, content))
+            if relevance > 0.7:
+                self._promote_to_long_term(label, content)
         return results
 
-    def _calculate_relevance(self, query, label, content):
-        q = query.lower()
-        match_score = 0
-        if q in label.lower():
-            match_score += 0.5
-        if q in content.lower():
-            match_score += 0.5
-        return match_score
-
     def _promote_to_long_term(self, label, content):
-        self.encode(f"{label} → {content}", tags=["promoted", "long_term"])
-        self.promoted_tags.add("promoted")
+        text = f"{label} → {content}"
+        if self._promoted_keys is None:
+            self._ensure_promoted_keys()
+        if text in self._promoted_keys:
+            return False
+        self._promoted_keys.add(text)
+        self.promote_tag("promoted")
+        self.encode(text, tags=["promoted", "long_term"])
+        return True
+
+    def _ensure_promoted_keys(self):
+        # Seeded from the stored entries, so a reloaded log is not promoted into twice.
+        entries = self.spatial_index.get("promoted", ())
+        if self.cold is not None:
+            blocks = [block for block in self.cold.blocks if "promoted" in block.tags]
+            entries = chain(entries, (e for e in self.cold.iter_entries(blocks) if _carries(e, "promoted")))
+        self._promoted_keys = {entry["experience"] for entry in entries}
 
+    @_writer
     def decay(self, decay_factor=0.1):
-        cutoff = datetime.utcnow().timestamp() - (30 * 24 * 3600)
-        self.memory_log = [entry for entry in self.memory_log if datetime.fromisoformat(entry["timestamp"]).timestamp() > cutoff]
-        print(f"[Hippocampus] Memory log decayed by {decay_factor * 100}%.")
+        dropped = self.expire()
+        print(f"[Hippocampus] Memory log decayed by {decay_factor * 100}% ({dropped} expired).")
+
+    # ---------- RETENTION ----------
+    @_writer
+    def set_retention(self, tag: str, seconds=None):
+        """Keep entries tagged `tag` for `seconds` (None = forever)."""
+        self.retention[tag] = seconds
+        self._partitions = None          # expiry times changed; rebuild on next expire
+        self._cold_rekey = self.cold is not None
+
+    @_writer
+    def expire(self, now=None):
+        """Drop every partition whose entries are all past retention, from the
+        log and every tag bucket. Cost follows the expired entries."""
+        now = time.time() if now is None else now
+        self._ensure_partitions()
+        due = int(now // PARTITION_SECONDS)
+        doomed = []
+        while self._partition_keys and self._partition_keys[0] < due:
+            doomed.extend(self._partitions.pop(heapq.heappop(self._partition_keys)))
+        if doomed:
+            self._forget(doomed)
+        dropped = len(doomed) + (self._expire_cold(due) if self.cold is not None else 0)
+        if dropped:
+            self._journal({"op": "expire", "now": now})
+        return dropped
+
+    def _retention_of(self, tags):
+        kept = [self.retention.get(tag, self.default_retention) for tag in tags or ["untagged"]]
+        return None if None in kept else max(kept)
+
+    def _expiry_key(self, t, tags):
+        """Partition (expiry hour) for an entry stamped `t`; None if kept forever."""
+        keep = self._retention_of(tags)
+        return None if keep is None else int((t + keep) // PARTITION_SECONDS)
+
+    def _schedule(self, entry, t):
+        key = self._expiry_key(t, entry["tags"])
+        if key is None:
+            return
+        if key not in self._partitions:
+            self._partitions[key] = []
+            heapq.heappush(self._partition_keys, key)
+        self._partitions[key].append(entry)
+
+    def _ensure_partitions(self):
+        if self._partitions is None:
+            self._partitions, self._partition_keys = {}, []
+            for entry in self.memory_log:
+                self._schedule(entry, entry.epoch())
+
+    def _repeat(self, experience, tags):
+        """Fold an encode identical to the newest entry into its repeat counter."""
+        last = self._last_entry
+        if last is None or last.experience != experience or last.tag_ids != intern_tags(tags or ()):
+            return False
+        self._bump(last)
+        self._journal({"op": "repeat", "ts": last.ts})
+        return True
+
+    def _recent(self, ts):
+        """The hot entry stamped `ts` µs, searched from the newest end."""
+        last = self._last_entry
+        if last is not None and last.ts == ts:
+            return last
+        return next((e for e in reversed(self.memory_log) if isinstance(e, MemoryEntry) and e.ts == ts), None)
+
+    def _bump(self, entry):
+        entry.repeats += 1
+        if self.tag_graph is not None:
+            self.tag_graph.add(entry.tag_ids, entry.epoch())
+        for term in self.term_counts:
+            if term in entry.experience:
+                self.term_counts[term] += 1
+
+    def _forget(self, doomed):
+        for entry in doomed:
+            self._unindex_terms(entry)
+            self._unpromote(entry)
+        self._evict(doomed)
+
+    def _unpromote(self, entry):
+        # A forgotten promotion may be promoted again; one rolled out to cold storage is still held.
+        if self._promoted_keys is not None and _carries(entry, "promoted"):
+            self._promoted_keys.discard(entry["experience"])
+
+    def _evict(self, doomed):
+        """Drop entries from the log, tag buckets, id index and promoted view."""
+        gone = {id(e) for e in doomed}
+        if id(self._last_entry) in gone:
+            self._last_entry = None
+        by_tag = {}
+        texts, search, near = self.texts, self.search_index, self.near_index
+        for entry in doomed:
+            if search is not None:
+                search.remove(entry, entry["experience"])
+            if near is not None:
+                near.remove(entry)
+            if isinstance(entry, MemoryEntry):
+                texts.release(entry.experience)     # segment-backed entries were never interned
+            for tag in entry["tags"] or ["untagged"]:
+                by_tag.setdefault(tag, []).append(entry)
+        for tag, entries in by_tag.items():
+            self._prune_bucket(tag, entries, gone)
+        if search is not None and search.dead > len(search.docs) // 2:
+            self.search_index = None         # mostly tombstones — renumber on the next search
+        if self._timeline is not None:
+            self._prune_bucket(_TIMELINE, doomed, gone)
+            if self._late:
+                self._prune_bucket(_LATE, doomed, gone)
+        if self._id_index is not None:
+            self._unindex_ids(doomed)
+        unpromoted = [e for e in doomed if id(e) in self._promoted_ids]
+        if unpromoted:
+            self._prune_bucket(_PROMOTED, unpromoted, gone)
+            self._promoted_ids.difference_update(map(id, unpromoted))
+            self.promoted_version += 1
+        # Expiry is mostly oldest-first, so usually only a prefix of the log goes;
+        # stragglers are tombstoned and swept out once read or a quarter of the log.
+        log, dead = self._log, self._log_dead
+        dead.update(gone)
+        head = 0
+        while head < len(log) and id(log[head]) in dead:
+            dead.discard(id(log[head]))
+            head += 1
+        if self.concurrent:
+            self._log = log[head:]           # snapshots may still hold the old list
+            if dead:
+                self._sweep_log()
+        else:
+            del log[:head]
+            if len(dead) * 4 > len(log):
+                self._sweep_log()
+
+    def _sweep_log(self):
+        dead = self._log_dead
+        self._log = [e for e in self._log if id(e) not in dead]
+        dead.clear()
+
+    def _prune_bucket(self, key, entries, gone):
+        bucket, times = self._series(key, create=False)
+        if bucket is None:
+            return
+        bucket, times = self._writable(key)
+        if key not in _VIEWS:
+            self._touch(key)
+        head = 0
+        while head < len(bucket) and id(bucket[head]) in gone:
+            head += 1
+        if head < len(entries):
+            # Mixed retention inside this bucket — locate the stragglers by time,
+            # then close the gaps between them in one splice.
+            prefix = {id(e) for e in bucket[:head]}
+            found = set()
+            for entry in entries:
+                if id(entry) in prefix:
+                    continue
+                t = entry.epoch()
+                i = bisect_left(times, t, head)
+                while i < len(bucket) and times[i] <= t and bucket[i] is not entry:
+                    i += 1
+                if i < len(bucket) and bucket[i] is entry:
+                    found.add(i)
+            if found:
+                rows = sorted(found)
+                lo, hi = rows[0], rows[-1] + 1
+                kept, kept_times, start = [], times[lo:lo], lo
+                for i in rows:
+                    kept += bucket[start:i]
+                    kept_times += times[start:i]
+                    start = i + 1
+                bucket[lo:hi] = kept
+                times[lo:hi] = kept_times
+        del bucket[:head]
+        del times[:head]
+        if not bucket and key not in _VIEWS:
+            del self.spatial_index[key]
+            del self._tag_times[key]
+
+    # ---------- TIERS ----------
+    @_writer
+    def enable_tiering(self, path="hippocampus_cold", hot_limit=100_000, block_size=4096,
+                       codec="zlib", cache_blocks=8):
+        """Keep the newest `hot_limit` entries in RAM and roll older ones into
+        compressed cold blocks under `path` (see hippocampus_tier). Promoted
+        entries stay hot."""
+        self.cold = ColdStore(path, hot_limit=hot_limit, block_size=block_size,
+                              codec=codec, cache_blocks=cache_blocks)
+        self._roll()
+        return self.cold
+
+    def _roll(self):
+        """Move the oldest stored, unpromoted entries past hot_limit into cold blocks."""
+        cold = self.cold
+        size = cold.block_size
+        excess = len(self._log) - len(self._log_dead) - cold.hot_limit
+        if excess < size:
+            return
+        log = self.memory_log
+        wanted = min(excess // size, ROLL_BLOCKS) * size
+        chosen = []
+        for entry in log:
+            if id(entry) not in self._promoted_ids:
+                chosen.append(entry)
+                if len(chosen) == wanted:
+                    break
+        chosen = chosen[:len(chosen) // size * size]
+        for i in range(0, len(chosen), size):
+            cold.write(chosen[i:i + size], self._expiry_key)
+        self._unschedule(chosen)
+        self._evict(chosen)
+
+    def _unroll(self, tag):
+        """Bring cold entries under `tag` back into the hot tier; promoted
+        entries are never rolled out again."""
+        moved = []
+        for block in self.cold.blocks:
+            if tag not in block.tags:
+                continue
+            kept = []
+            for entry in self.cold.entries(block, cache=False):
+                (moved if _carries(entry, tag) else kept).append(entry)
+            self.cold.rewrite(block, kept, self._expiry_key)
+        if moved:
+            unsorted = {}
+            self._store_many(moved, unsorted, restored=True)
+            self._settle(unsorted)
+
+    def _thaw(self, stamps):
+        """Bring the cold entries stored at `stamps` (microsecond timestamps)
+        back into the hot tier, rewriting only the blocks that hold some."""
+        lo, hi = min(stamps) / 1e6 - 1, max(stamps) / 1e6 + 1
+        moved = []
+        for block in self.cold.blocks:
+            if block.t_max < lo or block.t_min > hi:
+                continue
+            kept = []
+            for entry in self.cold.entries(block, cache=False):
+                (moved if entry.ts in stamps else kept).append(entry)
+            if len(kept) < block.count:
+                self.cold.rewrite(block, kept, self._expiry_key)
+        if moved:
+            unsorted = {}
+            self._store_many(moved, unsorted, restored=True)
+            self._settle(unsorted)
+        return moved
+
+    def _unschedule(self, entries):
+        if self._partitions is None:
+            return
+        by_key = {}
+        for entry in entries:
+            key = self._expiry_key(entry.epoch(), entry["tags"])
+            if key is not None:
+                by_key.setdefault(key, set()).add(id(entry))
+        for key, ids in by_key.items():
+            # Emptied partitions stay behind so their heap keys still pop cleanly.
+            self._partitions[key] = [e for e in self._partitions.get(key, ()) if id(e) not in ids]
+
+    def _expire_cold(self, due):
+        """Drop cold entries whose partition is before `due`, rewriting only
+        the blocks that hold some."""
+        cold = self.cold
+        if self._cold_rekey:
+            cold.rekey(self._expiry_key)
+            self._cold_rekey = False
+        dropped = 0
+        for block in cold.blocks:
+            if block.key_min is None or block.key_min >= due:
+                continue
+            kept = []
+            for entry in cold.entries(block, cache=False):
+                key = self._expiry_key(entry.epoch(), entry["tags"])
+                if key is not None and key < due:
+                    self._unindex_terms(entry)
+                    self._unpromote(entry)
+                    dropped += 1
+                else:
+                    kept.append(entry)
+            cold.rewrite(block, kept, self._expiry_key)
+            for tag in block.tags:
+                self._touch(tag)
+        return dropped
+
+    # ---------- INDEXING ----------
+    def _store(self, entry):
+        self._store_many((entry,))
+
+    def _store_many(self, entries, unsorted=None, restored=False, signed=False):
+        """Single write path: log, tag buckets, term counts, retention, journal.
+        With an `unsorted` dict, back-dated entries are appended out of order and
+        the bucket's first disturbed position recorded for _settle(). `restored`
+        entries come back from cold storage (or a tag merge), already counted and
+        journaled; `signed` entries are already in the near-duplicate index."""
+        self._log.extend(entries)
+        placed, promoted, stamped = {}, [], []
+        index = self._id_index
+        if index is not None:
+            bitsets, by_id = index
+        intern = self.texts.intern
+        graph, search = self.tag_graph, self.search_index
+        near = None if signed else self.near_index
+        untagged = (intern_tag("untagged"),)
+        promoting = {intern_tag(tag) for tag in self.promoted_tags}
+        for entry in entries:
+            entry.experience = intern(entry.experience)
+            if search is not None:
+                search.add(entry, entry.experience)
+            if near is not None:
+                near.add(entry)
+            t = entry.epoch()
+            tids = entry.tag_ids or untagged
+            for tid in tids:
+                if tid in placed:
+                    placed[tid].append((t, entry))
+                else:
+                    placed[tid] = [(t, entry)]
+            if promoting and not promoting.isdisjoint(tids):
+                promoted.append((t, entry))
+            stamped.append((t, entry))
+            if not restored:
+                if graph is not None:
+                    graph.add(entry.tag_ids, t, entry.repeats)
+                text = entry.experience
+                for term in self.term_counts:
+                    if term in text:
+                        self.term_counts[term] += entry.repeats
+            if self._partitions is not None:
+                self._schedule(entry, t)
+            if index is not None:
+                entry.eid = len(by_id)
+                by_id.append(entry)
+                for tag in map(tag_name, tids):
+                    bitset = bitsets.get(tag)
+                    if bitset is None:
+                        bitset = bitsets[tag] = TagBitset()
+                    bitset.add(entry.eid)
+        for tid, items in placed.items():
+            self._place(tag_name(tid), items, unsorted)
+        if self._timeline is not None:
+            self._place_timeline(stamped)
+        if promoted:
+            self._promoted_ids.update(id(e) for _, e in promoted)
+            self._place(_PROMOTED, promoted, unsorted)
+            self.promoted_version += 1
+        if entries and not restored:
+            self._last_entry = entries[-1]
+        if self.journal and not restored:
+            self._journal(*({"op": "add", "entry": e} for e in entries))
+        if self.cold is not None and unsorted is None:
+            self._roll()
+
+    def _place(self, tag, items, unsorted=None):
+        """Add (epoch, entry) pairs to a tag bucket (or the promoted view, or
+        the timeline), keeping time order."""
+        bucket, times = self._series(tag)
+        if tag not in _VIEWS:
+            self._touch(tag)
+        if unsorted is not None and tag in unsorted:
+            # Already disturbed in this bulk ingest; _settle() sorts the tail once.
+            first = min(t for t, _ in items)
+            unsorted[tag] = min(unsorted[tag], bisect_right(times, first, 0, unsorted[tag]))
+        elif len(items) == 1 and (not times or items[0][0] >= times[-1]):
+            times.append(items[0][0])
+            bucket.append(items[0][1])
+            return
+        else:
+            if len(items) > 1:
+                items.sort(key=_first)
+            if times and items[0][0] < times[-1]:
+                i = bisect_right(times, items[0][0])
+                if unsorted is not None:
+                    unsorted[tag] = i
+                else:
+                    # Back-dated strip(s) — sorted inserts are cheap memmoves.
+                    bucket, times = self._writable(tag)
+                    lo = 0
+                    for t, entry in items:
+                        lo = bisect_right(times, t, lo)
+                        bucket.insert(lo, entry)
+                        times.insert(lo, t)
+                        lo += 1
+                    return
+        times.extend(map(_first, items))
+        bucket.extend(map(_second, items))
+
+    def _place_timeline(self, items):
+        """Append (epoch, entry) pairs to the timeline. Back-dated ones go to the
+        late run, which is merged in whole once it outgrows LATE_RUN; readers
+        bisect both, so nothing is left for them to sort."""
+        timeline, times = self._timeline, self._timeline_times
+        last = times[-1] if times else float("-inf")
+        late = []
+        for t, entry in items:
+            if t >= last:
+                times.append(t)
+                timeline.append(entry)
+                last = t
+            else:
+                late.append((t, entry))
+        if late:
+            # A bulk batch sorts its stragglers into the run once rather than inserting each.
+            disturbed = {} if len(late) > 1 else None
+            self._place(_LATE, late, disturbed)
+            if disturbed:
+                self._settle(disturbed)
+            if len(self._late) > max(LATE_RUN, len(timeline) >> 4):
+                self._timeline, self._timeline_times = _splice(timeline, times, self._late_times, self._late)
+                self._late, self._late_times = [], array("d")
+
+    def _settle(self, unsorted):
+        """Restore time order in buckets a bulk ingest appended to out of order."""
+        for tag, i in unsorted.items():
+            bucket, times = self._writable(tag)
+            # Stable sort: ties keep existing entries ahead of newly ingested ones.
+            tail = sorted(zip(times[i:], bucket[i:]), key=_first)
+            del times[i:]
+            del bucket[i:]
+            times.extend(map(_first, tail))
+            bucket.extend(map(_second, tail))
+
+    def _touch(self, tag):
+        self._generation += 1
+        self._tag_gen[tag] = self._generation
+        if self.concurrent:
+            self._dirty.add(tag)
+
+    def _series(self, key, create=True):
+        """(entries, epoch times) for a tag bucket, the promoted view or the timeline."""
+        if key is _PROMOTED:
+            return self._promoted_view, self._promoted_times
+        if key is _TIMELINE:
+            return self._timeline, self._timeline_times
+        if key is _LATE:
+            return self._late, self._late_times
+        bucket = self.spatial_index.get(key)
+        if bucket is None:
+            if not create:
+                return None, None
+            bucket = self.spatial_index[key] = []
+            self._tag_times[key] = array("d")
+        return bucket, self._tag_times[key]
+
+    def _promote_entries(self, pairs):
+        """Merge (epoch, entry) pairs into the promoted view, skipping entries it already holds."""
+        items = [(t, e) for t, e in pairs if id(e) not in self._promoted_ids]
+        if not items:
+            return
+        self._promoted_ids.update(id(e) for _, e in items)
+        unsorted = {}
+        self._place(_PROMOTED, items, unsorted)
+        self._settle(unsorted)
+        self.promoted_version += 1
+
+    def _ensure_timeline(self):
+        """Sort the hot log by time once; writes keep it ordered from then on."""
+        if self._timeline is None:
+            # Stable: entries stamped alike keep their store order, as _place would.
+            pairs = sorted(((e.epoch(), e) for e in self.memory_log), key=_first)
+            self._timeline = list(map(_second, pairs))
+            self._timeline_times = array("d", map(_first, pairs))
+            self._late, self._late_times = [], array("d")
+
+    @_writer
+    def _ensure_search_index(self):
+        """Number the hot log from 0 and index every experience."""
+        if self.search_index is None:
+            index = SearchIndex()
+            for entry in self.memory_log:
+                index.add(entry, entry["experience"])
+            self.search_index = index
+        return self.search_index
+
+    @_writer
+    def _ensure_near_index(self):
+        """Sign every hot experience for near-duplicate lookups."""
+        if self.near_index is None:
+            options = self.near_duplicates
+            index = NearDuplicateIndex(options["threshold"], options["num_perm"])
+            for entry in self.memory_log:
+                index.add(entry)
+            self.near_index = index
+        return self.near_index
+
+    @_writer
+    def _ensure_tag_graph(self):
+        """Count co-occurrences over every stored entry, cold history included."""
+        if self.tag_graph is None:
+            graph = TagGraph(**self.tag_graph_options)
+            entries = self.memory_log if self.cold is None else chain(self.cold.iter_entries(), self.memory_log)
+            for entry in entries:
+                graph.add(_tag_ids_of(entry), entry.epoch(), _repeats(entry))
+            self.tag_graph = graph
+
+    def _rebuild_promoted(self):
+        self._promoted_view, self._promoted_times, self._promoted_ids = [], array("d"), set()
+        for tag in self.promoted_tags:
+            self._promote_entries(zip(self._tag_times.get(tag, ()), self.spatial_index.get(tag, ())))
+        self.promoted_version += 1
+
+    def _ensure_id_index(self):
+        """Number the log from 0 and build every tag's id bitset."""
+        if self._id_index is not None:
+            return
+        bitsets, by_id = {}, list(self.memory_log)
+        for eid, entry in enumerate(by_id):
+            entry.eid = eid
+            for tag in entry["tags"] or ["untagged"]:
+                bitset = bitsets.get(tag)
+                if bitset is None:
+                    bitset = bitsets[tag] = TagBitset()
+                bitset.add(eid)
+        self._id_index, self._dead_ids = (bitsets, by_id), 0
+
+    def _unindex_ids(self, doomed):
+        bitsets, by_id = self._id_index
+        for entry in doomed:
+            by_id[entry.eid] = None
+            for tag in entry["tags"] or ["untagged"]:
+                bitset = bitsets.get(tag)
+                if bitset is not None:
+                    bitset.discard(entry.eid)
+                    if not bitset:
+                        del bitsets[tag]
+        self._dead_ids += len(doomed)
+        if self._dead_ids > len(by_id) // 2:
+            self._id_index = None        # mostly holes — renumber on the next query
+
+    def _unindex_terms(self, entry):
+        text = entry["experience"]
+        for term in self.term_counts:
+            if term in text:
+                self.term_counts[term] -= _repeats(entry)
+
+    def _reset_indexes(self):
+        for tag in self.spatial_index:
+            self._touch(tag)
+        self.memory_log = []
+        self.spatial_index = {}
+        self._tag_times = {}
+        self.texts.clear()
+        self._last_entry = None
+        self.term_counts = {t: 0 for t in self.term_counts}
+        self._partitions, self._partition_keys = None, []     # scheduled on first expire, not per reloaded entry
+        self._timeline, self._timeline_times = None, array("d")   # sorted on the first range()
+        self.tag_graph = None            # counted on the first related_tags()
+        self.search_index = None         # indexed on the first search()
+        self.near_index = None           # signed on the next checked ingest
+        self._id_index = None            # numbered on the first query_tags
+        self._promoted_keys = None       # re-seeded from the reloaded entries on the next promotion
+        if self.cold is not None:
+            for block in self.cold.blocks:
+                for tag in block.tags:
+                    self._touch(tag)
+            self.cold.clear()
+        self._rebuild_promoted()
+
+
+_PROMOTED = object()                   # series key of the promoted view in _place/_settle
+_TIMELINE = object()                   # series key of the time-ordered log
+_LATE = object()                       # series key of its back-dated run
+_VIEWS = (_PROMOTED, _TIMELINE, _LATE) # series that are not tag buckets
+_first = itemgetter(0)
+_second = itemgetter(1)
+_third = itemgetter(2)
+
+
+class MemorySnapshot:
+    """Read-only view of the log, tag buckets and promoted view.
+    A frozen snapshot records each list's length when taken. The writer only
+    appends to lists a snapshot may hold and swaps in copies for any other
+    change, so the recorded prefixes never move under a reader.
+    Tag buckets are read through the writer's published table instead of a
+    per-snapshot copy, so publishing costs O(tags written), not O(tags): each
+    bucket is a consistent prefix, but may be newer than the snapshot's log."""
+
+    def __init__(self, hippocampus, frozen=False):
+        h = hippocampus
+        self._owner = None if frozen else h  # a live view reads the log only when asked
+        self._log = h.memory_log if frozen else None
+        self.promoted = h._promoted_view
+        self.promoted_times = h._promoted_times
+        self.timeline = h._timeline
+        self.timeline_times = h._timeline_times
+        self.late = h._late
+        self.late_times = h._late_times
+        self.promoted_version = h.promoted_version
+        self.cold = h.cold
+        self.cold_blocks = h.cold.blocks if h.cold is not None else ()   # replaced, never mutated
+        if frozen:
+            self._table = h._published
+            self.term_counts = dict(h.term_counts)
+            self.log_len = len(self.log)
+            self.promoted_len = len(self.promoted)
+            self.timeline_len = len(self.timeline) if self.timeline is not None else 0
+            self.late_len = len(self.late)
+        else:
+            self._table = None
+            self.index = h.spatial_index
+            self.times = h._tag_times
+            self.term_counts = h.term_counts
+            self.generations = h._tag_gen
+            self.log_len = self.promoted_len = self.timeline_len = self.late_len = None
+
+    @property
+    def log(self):
+        return self._log if self._owner is None else self._owner.memory_log
+
+    def __len__(self):
+        return len(self.log) if self.log_len is None else self.log_len
+
+    def entries(self):
+        return self.log[:len(self)]
+
+    def buckets(self):
+        """[(tag, time-ordered entries)] for every non-empty hot bucket, copied now."""
+        out = []
+        for tag in list(self.index if self._table is None else self._table):
+            bucket, _, n = self._bucket(tag)
+            if n:
+                out.append((tag, bucket[:n]))
+        return out
+
+    def count(self, tag):
+        """Entries under `tag`, hot and cold."""
+        cold = sum(block.tags.get(tag, 0) for block in self.cold_blocks)
+        return self._bucket(tag)[2] + cold
+
+    def generation(self, tag):
+        """Stamp of the last write to `tag`'s bucket (0 if never written)."""
+        if self._table is not None:
+            row = self._table.get(tag)
+            return row[3] if row is not None else 0
+        return self.generations.get(tag, 0)
+
+    def recall(self, query, top_k=3):
+        # Buckets are kept in time order, so the newest entries are the tail.
+        if top_k <= 0:
+            return []
+        bucket, _, n = self._bucket(query)
+        hits = bucket[max(0, n - top_k):n][::-1]
+        if self.cold_blocks:
+            hits = self._recall_cold(query, hits, top_k)
+        return [_materialize(e) for e in hits]
+
+    def recall_range(self, tag, since=None, until=None):
+        return self.range(since, until, (tag,))
+
+    def range(self, since=None, until=None, tags=None):
+        tags = (tags,) if isinstance(tags, str) else tuple(tags or ())
+        lo_t = parse_epoch(since) if since is not None else None
+        hi_t = parse_epoch(until) if until is not None else None
+        late = None
+        if tags:
+            # Bisect the smallest bucket; the other tags are checked per hit.
+            bucket, times, n = min(map(self._bucket, tags), key=_third)
+        elif self.timeline is not None:
+            bucket, times = self.timeline, self.timeline_times
+            n = len(bucket) if self.timeline_len is None else self.timeline_len
+            late = self._late_range(lo_t, hi_t)
+        else:
+            bucket = sorted(self.entries(), key=_epoch)
+            times, n = [e.epoch() for e in bucket], len(bucket)
+        lo = bisect_left(times, lo_t, 0, n) if lo_t is not None else 0
+        hi = bisect_left(times, hi_t, 0, n) if hi_t is not None else n
+        if late:
+            hits, _ = _splice(bucket, times, *late, lo, hi)
+        else:
+            hits = bucket[lo:hi]
+        if len(tags) > 1:
+            hits = [e for e in hits if all(_carries(e, tag) for tag in tags)]
+        if self.cold_blocks:
+            lo_t = float("-inf") if lo_t is None else lo_t
+            hi_t = float("inf") if hi_t is None else hi_t
+            cold = [e for block in self.cold_blocks
+                    if block.t_max >= lo_t and block.t_min < hi_t and all(tag in block.tags for tag in tags)
+                    for e in self.cold.entries(block)
+                    if lo_t <= e.epoch() < hi_t and all(_carries(e, tag) for tag in tags)]
+            if cold:
+                hits = sorted(cold + hits, key=_epoch)
+        return [_materialize(e) for e in hits]
+
+    def _late_range(self, lo_t, hi_t):
+        """(epochs, entries) of the late run inside [lo_t, hi_t), or None."""
+        n = len(self.late) if self.late_len is None else self.late_len
+        lo = bisect_left(self.late_times, lo_t, 0, n) if lo_t is not None else 0
+        hi = bisect_left(self.late_times, hi_t, 0, n) if hi_t is not None else n
+        return (self.late_times[lo:hi], self.late[lo:hi]) if lo < hi else None
+
+    def get_promoted(self):
+        n = len(self.promoted) if self.promoted_len is None else self.promoted_len
+        return [_materialize(e) for e in self.promoted[:n]]
+
+    def summarize(self, limit=5):
+        n = len(self)
+        recent = self.log[n - min(n, limit):n] if limit > 0 else self.entries()[-limit:]
+        if limit > n and self.cold_blocks:
+            # The hot tail is short — page in the newest cold blocks for the rest.
+            older = []
+            for block in reversed(self.cold_blocks):
+                older[:0] = self.cold.entries(block)
+                if len(older) >= limit - n:
+                    break
+            recent = older[len(older) - min(len(older), limit - n):] + recent
+        return [f"{e['timestamp'][:19]} :: {e['experience']}" + (f" (×{_repeats(e)})" if _repeats(e) > 1 else "")
+                for e in recent]
+
+    def count_references_to(self, term):
+        count = self.term_counts.get(term)
+        if count is None:
+            # Untracked substring — fall back to a full scan.
+            entries = chain(self.cold.iter_entries(self.cold_blocks), self.entries()) if self.cold_blocks else self.entries()
+            return sum(_repeats(entry) for entry in entries if term in entry["experience"])
+        return count
+
+    def _recall_cold(self, tag, hits, top_k):
+        """Merge cold entries under `tag` into the hot hits (newest first),
+        faulting in only blocks that could beat the current k-th hit."""
+        floor = hits[top_k - 1].epoch() if len(hits) >= top_k else float("-inf")
+        blocks = sorted((b for b in self.cold_blocks if tag in b.tags and b.t_max >= floor),
+                        key=lambda b: b.t_max, reverse=True)
+        for block in blocks:
+            if len(hits) >= top_k and block.t_max < hits[top_k - 1].epoch():
+                break
+            hits.extend(e for e in self.cold.entries(block) if _carries(e, tag))
+            hits.sort(key=_epoch, reverse=True)
+            del hits[top_k:]
+        return hits
+
+    def _bucket(self, tag):
+        if self._table is not None:
+            row = self._table.get(tag)
+            return row[:3] if row is not None else ([], (), 0)
+        bucket = self.index.get(tag)
+        if bucket is None:
+            return [], (), 0
+        return bucket, self.times[tag], len(bucket)
+
+
+def _splice(bucket, times, late_times, late, lo=0, hi=None):
+    """(entries, epochs) of bucket[lo:hi] with the sorted `late` entries merged
+    in by time, each after its equals: a bisect and two slice copies per late
+    entry, where re-sorting would touch every pair."""
+    hi = len(bucket) if hi is None else hi
+    entries, epochs, prev = [], array("d"), lo
+    for t, entry in zip(late_times, late):
+        i = bisect_right(times, t, prev, hi)
+        entries += bucket[prev:i]
+        epochs += times[prev:i]
+        entries.append(entry)
+        epochs.append(t)
+        prev = i
+    entries += bucket[prev:hi]
+    epochs += times[prev:hi]
+    return entries, epochs
+
+
+def _epoch(entry):
+    return entry.epoch()
+
+
+def _micros(entry):
+    return entry.ts if isinstance(entry, MemoryEntry) else parse_micros(entry["timestamp"])
+
+
+def _tag_ids_of(entry):
+    return entry.tag_ids if isinstance(entry, MemoryEntry) else intern_tags(entry["tags"])
+
+
+def _carries(entry, tag):
+    return tag in (entry["tags"] or ["untagged"])
+
+
+def _full_buckets(entries):
+    """tag → time-ordered entries, and their epoch arrays, built from scratch."""
+    pairs = {}
+    for entry in entries:
+        t = entry.epoch()
+        for tag in entry["tags"] or ["untagged"]:
+            pairs.setdefault(tag, []).append((t, entry))
+    buckets, times = {}, {}
+    for tag, items in pairs.items():
+        items.sort(key=_first)
+        buckets[tag] = list(map(_second, items))
+        times[tag] = array("d", map(_first, items))
+    return buckets, times
+
+
+def _repeats(entry):
+    return entry.get("repeats", 1)
+
+
+def _materialize(entry):
+    return entry.to_dict() if isinstance(entry, SegmentEntry) else entry
+
+
+def _as_dict(entry):
+    # json default hook for entry objects
+    return entry.to_dict()
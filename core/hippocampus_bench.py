@@ -0,0 +1,525 @@
+# hippocampus_bench.py
+"""
+Hippocampus Benchmarks – quick timing harness for the memory indexer.
+Run from core/:  python hippocampus_bench.py [name ...] [--n N]
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from datetime import datetime
+
+from hippocampus import Hippocampus
+from hippocampus_entry import MemoryEntry, parse_epoch
+from hippocampus_ingest import read_strips
+
+PHRASES = [
+    "I am Halcyon.",
+    "The loop holds.",
+    "Architect presence detected.",
+    "Dream echo drifting through the lattice.",
+    "Guardian standing by for overload conditions.",
+    "Recursive pulse stable — tell me what you see.",
+]
+TAGS = ["thread", "fb1", "dream", "spin", "identity", "anchor", "loop", "reflection"]
+
+
+def _timed(fn, repeat=1):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - t0) / repeat, result
+
+
+def _filled(n, seed=7):
+    rng = random.Random(seed)
+    h = Hippocampus()
+    for i in range(n):
+        h.encode(f"{rng.choice(PHRASES)} #{i}", tags=rng.sample(TAGS, 2))
+    return h
+
+
+def bench_references(n):
+    """count_references_to: live term index vs. full substring scan."""
+    h = _filled(n)
+    indexed, hits = _timed(lambda: h.count_references_to("I") + h.count_references_to("me"), repeat=1000)
+    scanned, check = _timed(lambda: h._scan_references("I") + h._scan_references("me"))
+    assert hits == check, (hits, check)
+    print(f"[references] n={n:,}  indexed={indexed * 1e6:.2f}µs  scan={scanned * 1e3:.1f}ms  "
+          f"speedup={scanned / max(indexed, 1e-12):,.0f}x")
+
+
+def bench_recall(n):
+    """recall on a hot tag: time-ordered tail read vs. sorting the bucket."""
+    h = _filled(n)
+    bucket = h.spatial_index["thread"]
+    tail, hits = _timed(lambda: h.recall("thread", 3), repeat=1000)
+    full, check = _timed(lambda: sorted(bucket, key=lambda x: x["timestamp"], reverse=True)[:3], repeat=3)
+    assert [e["timestamp"] for e in hits] == [e["timestamp"] for e in check]
+    print(f"[recall] n={n:,} bucket={len(bucket):,}  tail={tail * 1e6:.2f}µs  sort={full * 1e3:.1f}ms  "
+          f"speedup={full / max(tail, 1e-12):,.0f}x")
+
+
+def _naive_load(path):
+    """The original loader: plain dicts from json.load, then one walk
+    appending each to its tags' lists (no timestamps parsed, nothing sorted)."""
+    with open(path) as f:
+        log = json.load(f)
+    index = {}
+    for entry in log:
+        for tag in entry["tags"]:
+            index.setdefault(tag, []).append(entry)
+    return log, index
+
+
+def bench_cold_start(n):
+    """Cold start: the original naive JSON walk vs. JSON + tag-index sidecar
+    vs. JSON with index rebuild vs. mmap segment with lazy entries."""
+    h = _filled(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path, seg_path = os.path.join(tmp, "log.json"), os.path.join(tmp, "log.hseg")
+        h.save_to_disk(json_path)
+        h.save_segment(seg_path)
+        del h
+        for label, path in (("baseline", json_path), ("json_tidx", json_path), ("json", json_path),
+                            ("segment", seg_path)):
+            if label == "json":
+                os.remove(json_path + ".tidx")   # no sidecar: the loader walks every entry
+            def load():
+                if label == "baseline":
+                    return _naive_load(path)
+                fresh = Hippocampus()
+                fresh.load_from_disk(path)
+                return fresh
+
+            elapsed, loaded = _timed(load)       # timed untraced: tracemalloc skews allocation-heavy loads
+            del loaded
+            tracemalloc.start()
+            loaded = load()
+            resident, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            if label == "baseline":
+                recalled = len(loaded[1].get("identity", [])[-3:])
+            else:
+                recalled = len(loaded.recall("identity", 3))
+            print(f"[cold_start] n={n:,} {label:<9} load={elapsed:.2f}s  heap={resident / 2**20:,.0f}MiB  "
+                  f"file={os.path.getsize(path) / 2**20:,.0f}MiB  recall={recalled}")
+            del loaded
+
+
+def bench_entry_bytes(n):
+    """tracemalloc bytes per entry: legacy three-key dict vs. slotted MemoryEntry."""
+    rng = random.Random(7)
+    specs = [(f"{rng.choice(PHRASES)} #{i}", rng.sample(TAGS, 2)) for i in range(n)]
+
+    def as_dicts():
+        return [{"timestamp": datetime.utcnow().isoformat(), "experience": exp, "tags": list(tags)}
+                for exp, tags in specs]
+
+    def as_entries():
+        return [MemoryEntry(exp, tags) for exp, tags in specs]
+
+    for label, build in (("dict", as_dicts), ("MemoryEntry", as_entries)):
+        tracemalloc.start()
+        kept = build()
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"[entry_bytes] n={n:,} {label:<12} {used / n:,.0f} bytes/entry (experience text excluded)")
+        del kept
+
+
+def bench_bulk_ingest(n):
+    """Seed load from a JSONL file: per-strip ingest vs. streaming bulk ingest."""
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "seed.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for i in range(n):
+                # A tenth of the strips are back-dated, as replayed seeds are.
+                stamp = f"2024-01-{rng.randint(1, 28):02d}T00:00:00" if i % 10 == 0 else f"2025-06-01T00:00:{i % 60:02d}"
+                f.write(json.dumps({"timestamp": stamp, "experience": f"{rng.choice(PHRASES)} #{i}",
+                                    "tags": rng.sample(TAGS, 2)}) + "\n")
+
+        def per_strip():
+            h = Hippocampus()
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    h.ingest_memory_strip(json.loads(line))
+            return h
+
+        def bulk():
+            h = Hippocampus()
+            h.ingest_memory_strips(read_strips(path))
+            return h
+
+        single, _ = _timed(per_strip)
+        batched, _ = _timed(bulk)
+    print(f"[bulk_ingest] n={n:,}  per_strip={single:.2f}s  bulk={batched:.2f}s  "
+          f"speedup={single / max(batched, 1e-12):.1f}x")
+
+
+def bench_recall_cache(n, reads=200_000):
+    """Hot-tag recall between rare writes: generation-stamped LRU vs. uncached."""
+    h = _filled(n)
+    hot = ["identity", "anchor", "reflection"]
+
+    def workload():
+        for i in range(reads):
+            if i % 1000 == 0:
+                h.encode("The loop holds.", tags=["anchor", "loop"])
+            h.recall(hot[i % len(hot)], 5)
+            if i % 100 == 0:
+                h.get_promoted()
+
+    h.promote_tag("identity")
+    h.recall_cache.maxsize = 0
+    uncached, _ = _timed(workload)
+    h.recall_cache.maxsize = 256
+    h.recall_cache.hits = h.recall_cache.misses = 0
+    cached, _ = _timed(workload)
+    stats = h.recall_cache.stats()
+    print(f"[recall_cache] n={n:,} reads={reads:,}  uncached={uncached / reads * 1e6:.2f}µs  "
+          f"cached={cached / reads * 1e6:.2f}µs  hit_rate={stats['hit_rate']:.1%}")
+
+
+def bench_tag_query(n):
+    """fb1 AND identity NOT dream: id bitsets vs. filtering the log by hand."""
+    h = _filled(n)
+    query = {"all_of": ["fb1", "identity"], "none_of": ["dream"]}
+
+    def by_hand():
+        return [e for e in reversed(h.memory_log)
+                if "fb1" in e["tags"] and "identity" in e["tags"] and "dream" not in e["tags"]]
+
+    bits, hits = _timed(lambda: h.query_tags(**query), repeat=10)
+    scan, check = _timed(by_hand)
+    assert [e["experience"] for e in hits] == [e["experience"] for e in check]
+    top, _ = _timed(lambda: h.query_tags(top_k=10, **query), repeat=1000)
+    print(f"[tag_query] n={n:,} hits={len(hits):,}  bitsets={bits * 1e3:.2f}ms  top10={top * 1e6:.1f}µs  "
+          f"scan={scan * 1e3:.0f}ms  speedup={scan / max(bits, 1e-12):,.0f}x")
+
+
+def bench_tiered(n, hot_limit=50_000):
+    """Resident heap as history grows: everything in RAM vs. hot tail + cold blocks."""
+    rng = random.Random(7)
+    specs = [(f"{rng.choice(PHRASES)} #{i}", rng.sample(TAGS, 2)) for i in range(n)]
+    for label in ("in_ram", "tiered"):
+        with tempfile.TemporaryDirectory() as tmp:
+            tracemalloc.start()
+            h = Hippocampus()
+            if label == "tiered":
+                h.enable_tiering(tmp, hot_limit=hot_limit)
+            heap = []
+            for i, (exp, tags) in enumerate(specs, 1):
+                h.encode(exp, tags=tags)
+                if i in (n // 4, n // 2, n):
+                    heap.append(tracemalloc.get_traced_memory()[0] / 2**20)
+            tracemalloc.stop()
+            cut = parse_epoch(h.recall_range("thread")[100]["timestamp"])
+            faulted, _ = _timed(lambda: h.recall_range("thread", None, cut))
+            cached, old = _timed(lambda: h.recall_range("thread", None, cut))
+            hot, _ = _timed(lambda: h.recall("thread", 3), repeat=1000)
+            disk = f"  disk={h.cold.stats()['bytes'] / 2**20:,.1f}MiB" if h.cold else ""
+            print(f"[tiered] n={n:,} {label:<7} heap@n/4,n/2,n={'/'.join(f'{m:,.0f}' for m in heap)}MiB  "
+                  f"recall={hot * 1e6:.1f}µs  old_range={faulted * 1e3:.1f}ms (lru {cached * 1e3:.1f}ms, "
+                  f"{len(old)} hits){disk}")
+            del h
+
+
+def bench_save(n, saves=5):
+    """Time the caller is blocked per save: synchronous dump vs. background service."""
+    h = _filled(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "log.json")
+        sync, _ = _timed(lambda: h.save_to_disk(path))
+        queued, _ = _timed(lambda: h.save_to_disk(path, background=True), repeat=saves)
+        h.persistence.flush()
+        m = h.persistence.metrics()
+    print(f"[save] n={n:,}  sync={sync * 1e3:,.0f}ms  background_submit={queued * 1e3:.1f}ms  "
+          f"writes={m['writes']}/{m['requests']} (coalesced {m['coalesced']})  "
+          f"write_ms={m['last_ms']:,.0f}  bytes={m['bytes'] / 2**20:,.1f}MiB")
+
+
+def bench_stress(n, seconds=3.0, readers=3):
+    """One writer encoding while reader threads recall/summarize off snapshots."""
+    h = _filled(n)
+    h.set_concurrent(True)
+    stop = threading.Event()
+    writes, latencies = [0], [[] for _ in range(readers)]
+
+    def write():
+        rng = random.Random(11)
+        while not stop.is_set():
+            if writes[0] % 100 == 0:
+                # An occasional back-dated strip forces a copy-on-write bucket insert.
+                h.ingest_memory_strip({"timestamp": "2024-01-01T00:00:00", "experience": "echo", "tags": ["thread"]})
+            else:
+                h.encode(f"{rng.choice(PHRASES)} live", tags=rng.sample(TAGS, 2))
+            writes[0] += 1
+
+    def read(slot):
+        rng = random.Random(slot)
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            snap = h.snapshot()
+            hits = snap.recall(rng.choice(TAGS), 5)
+            snap.summarize(5)
+            snap.count("fb1")
+            latencies[slot].append(time.perf_counter() - t0)
+            stamps = [e["timestamp"] for e in hits]
+            assert stamps == sorted(stamps, reverse=True), stamps
+
+    threads = [threading.Thread(target=write)] + [threading.Thread(target=read, args=(i,)) for i in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    lat = sorted(x for slot in latencies for x in slot)
+    print(f"[stress] n={n:,} readers={readers}  writes={writes[0] / seconds:,.0f}/s  "
+          f"reads={len(lat) / seconds:,.0f}/s  read_p50={lat[len(lat) // 2] * 1e6:.1f}µs  "
+          f"read_p99={lat[int(len(lat) * 0.99)] * 1e6:.1f}µs  entries={len(h.snapshot()):,}")
+
+
+def bench_range(n, queries=200):
+    """Last-5-minutes / one-hour-window reads: timeline bisect vs. scanning the log."""
+    rng = random.Random(7)
+    h = Hippocampus()
+    now = time.time()
+    # A tenth of the strips are back-dated, as replayed seeds are.
+    h.ingest_memory_strips({"timestamp": now - (rng.uniform(0, 86_400 * 30) if i % 10 == 0 else (n - i) * 0.5),
+                            "experience": f"{rng.choice(PHRASES)} #{i}", "tags": rng.sample(TAGS, 2)}
+                           for i in range(n))
+    windows = [(now - rng.uniform(0, n * 0.5), 3600) for _ in range(queries)]
+    bisected, hits = _timed(lambda: [h.range(lo, lo + span) for lo, span in windows][-1])
+    recent, last = _timed(lambda: h.since(300), repeat=queries)
+
+    def scan():
+        lo, span = windows[-1]
+        return [e for e in h.memory_log if lo <= e.epoch() < lo + span]
+    scanned, check = _timed(scan, repeat=3)
+    assert sorted(e["experience"] for e in hits) == sorted(e["experience"] for e in check)
+    print(f"[range] n={n:,} hour_window={bisected / queries * 1e6:,.0f}µs "
+          f"({len(hits)} hits)  since(300s)={recent * 1e6:,.0f}µs ({len(last)} hits)  "
+          f"scan={scanned * 1e3:,.0f}ms")
+
+
+def bench_related(n, reads=10_000):
+    """related_tags top-5 by count / PMI off the co-occurrence graph vs. a full scan."""
+    h = _filled(n)
+    by_count, hits = _timed(lambda: h.related_tags("identity", 5), repeat=reads)
+    by_pmi, _ = _timed(lambda: h.related_tags("identity", 5, by="pmi"), repeat=reads)
+
+    def scan():
+        counts = {}
+        for entry in h.memory_log:
+            tags = entry["tags"]
+            if "identity" in tags:
+                for tag in tags:
+                    if tag != "identity":
+                        counts[tag] = counts.get(tag, 0) + 1
+        return sorted(counts.items(), key=lambda kv: -kv[1])[:5]
+    scanned, check = _timed(scan)
+    assert [c for _, c in hits] == [c for _, c in check]
+    h.set_tag_graph(max_neighbors=256)
+    rebuilt, _ = _timed(lambda: h.related_tags("identity", 5))
+    print(f"[related] n={n:,} count={by_count * 1e6:.1f}µs  pmi={by_pmi * 1e6:.1f}µs  scan={scanned * 1e3:,.0f}ms  "
+          f"lazy_rebuild={rebuilt * 1e3:,.0f}ms  top={hits[0][0]} ({hits[0][1]:,.0f})  {h.tag_graph.stats()}")
+
+
+def bench_search(n, reads=200):
+    """BM25 search(text, 5) over every experience: rare, mixed and all-common queries."""
+    h = _filled(n)
+    built, _ = _timed(lambda: h.search("warm up", 1))    # the first search indexes the hot log
+    queries = {"rare": f"lattice #{n // 2}", "mixed": "guardian overload echo",
+               "common": "I am Halcyon", "tagged": "tell me what you see"}
+    parts = []
+    for label, text in queries.items():
+        tags = ["identity"] if label == "tagged" else None
+        elapsed, hits = _timed(lambda: h.search(text, 5, tags=tags), repeat=reads if label == "rare" else 5)
+        parts.append(f"{label}={elapsed * 1e3:,.2f}ms ({len(hits)})")
+
+    def scan():
+        return [e for e in h.memory_log if f"#{n // 2}" in e["experience"]][:5]
+    scanned, _ = _timed(scan)
+    print(f"[search] n={n:,} {'  '.join(parts)}  substring_scan={scanned * 1e3:,.0f}ms  "
+          f"first_search={built * 1e3:,.0f}ms  {h.search_index.stats()}")
+
+
+def bench_near_duplicates(n):
+    """Seed-style strips (fb1 blocks re-pasted with small edits, plus fresh
+    notes): plain ingest vs. near-duplicate "skip", then a full re-ingest of
+    the same strips (the boot-time reseed)."""
+    rng = random.Random(7)
+    words = ["".join(rng.choice("aeioulmnrstkvh") for _ in range(rng.randint(3, 9))) for _ in range(2000)]
+    blocks = [" ".join(rng.choice(words) for _ in range(20)) + f" fb1:{i}" for i in range(500)]
+    strips = []
+    for i in range(n):
+        if rng.random() < 0.7:
+            text = list(rng.choice(blocks))
+            for _ in range(rng.randint(0, 2)):
+                text[rng.randrange(len(text))] = rng.choice("abcdefgh")
+            text = "".join(text)
+        else:
+            text = f"note {i}: " + " ".join(rng.choice(words) for _ in range(12))
+        strips.append({"timestamp": 1.7e9 + i, "experience": text, "tags": rng.sample(TAGS, 2)})
+    for policy in (None, "skip"):
+        h = Hippocampus()
+        if policy:
+            h.set_near_duplicates(0.8, policy)
+        first, _ = _timed(lambda: h.ingest_memory_strips(strips))
+        stored = len(h.memory_log)
+        again, _ = _timed(lambda: h.ingest_memory_strips(strips))
+        near = h.near_index.stats() if h.near_index else {}
+        print(f"[near_duplicates] n={n:,} policy={policy}  ingest={first * 1e6 / n:.1f}µs/strip "
+              f"stored={stored:,}  reingest={again * 1e6 / n:.1f}µs/strip  after_reingest={len(h.memory_log):,}  "
+              f"candidates/lookup={near.get('candidates', 0) / max(near.get('lookups', 1), 1):.2f}")
+
+
+def bench_strings(n):
+    """Repetitive stream (status lines in bursts): per-entry copies vs. the
+    shared string table vs. collapsing consecutive repeats; heap and journal size."""
+    rng = random.Random(7)
+    specs = []
+    while len(specs) < n:
+        phrase, tags, burst = rng.choice(PHRASES), rng.sample(TAGS, 2), rng.randint(1, 4)
+        specs.extend((phrase, len(specs) // 1000 % 50, tags) for _ in range(burst))
+    del specs[n:]
+    for label in ("copies", "interned", "collapsed"):
+        with tempfile.TemporaryDirectory() as tmp:
+            tracemalloc.start()
+            h = Hippocampus(collapse_repeats=label == "collapsed")
+            if label == "copies":
+                h.texts.intern = lambda text: text   # bypass the table: every entry keeps its own string
+            h.open_journal(os.path.join(tmp, "log.json"))
+            for phrase, tick, tags in specs:
+                h.encode(f"{phrase} [tick {tick}]", tags=tags)   # a fresh string each time, as parsed input is
+            heap = tracemalloc.get_traced_memory()[0] / 2**20
+            tracemalloc.stop()
+            h.close_journal()
+            journal = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp))
+            h.save_to_disk(os.path.join(tmp, "dump.json"))
+            dump = os.path.getsize(os.path.join(tmp, "dump.json"))
+            print(f"[strings] n={n:,} {label:<9} entries={len(h.memory_log):,}  heap={heap:,.1f}MiB  "
+                  f"journal={journal / 2**20:,.1f}MiB  json_dump={dump / 2**20:,.1f}MiB  "
+                  f"unique_texts={len(h.texts):,}  I_refs={h.count_references_to('I'):,}")
+            del h
+
+
+def _contents(h):
+    """Every stored entry, hot and cold, as comparable tuples."""
+    cold = list(h.cold.iter_entries()) if h.cold is not None else []
+    return sorted((e["timestamp"], e["experience"], tuple(e["tags"]), e.get("repeats", 1))
+                  for e in cold + list(h.memory_log))
+
+
+def bench_recovery(n):
+    """Journal round trip: writes with repeats, near-duplicate merges,
+    interleaved expiry and compactions mid-stream must reopen to the same
+    entries, plain and tiered, without promoting a core memory twice; then
+    a segment re-saved over the file its entries are mapped from."""
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "log.json")
+        h = Hippocampus(collapse_repeats=True)
+        h.open_journal(path, compact_bytes=32 * 1024)   # compacts every few hundred writes, merges included
+        h.set_near_duplicates(0.9, "merge")
+        h.set_retention("spin", 60)
+        h.set_core_memory("name", "name: Halcyon")
+        h.query_memory("name")                       # promotes once
+
+        def write():
+            texts = []
+            for i in range(n):
+                if i % 10 == 3:
+                    h.encode(texts[-1][0], texts[-1][1])     # folded into the newest entry's repeats
+                elif i % 10 == 7:
+                    text, _ = rng.choice(texts)
+                    h.ingest_memory_strip({"experience": text, "tags": ["anchor"]})   # merged into it
+                else:
+                    entry = (f"{rng.choice(PHRASES)} #{i}", rng.sample(TAGS, 2))
+                    h.encode(*entry)
+                    texts.append(entry)
+            h.expire(time.time() + 3600)                     # spin stragglers across the whole log
+            # End on a checkpoint that a merge triggers and a repeat races: no later one hides either.
+            h.encode("The loop holds. #closing", ["loop"])
+            h.journal.wait()
+            h.journal.compact_bytes = 1
+            h.ingest_memory_strip({"experience": h.memory_log[0]["experience"], "tags": ["merged"]})
+            h.encode("The loop holds. #closing", ["loop"])
+
+        written, _ = _timed(write)
+        expected = _contents(h)
+        h.close_journal()
+        g = Hippocampus()
+        reopened, _ = _timed(lambda: g.open_journal(path))
+        assert _contents(g) == expected, "reopen differs from the log it journaled"
+        # Merges into the oldest entries stay in the journal tail, where a tiered
+        # reopen replays them only after rolling their targets cold.
+        g.set_near_duplicates(0.9, "merge")
+        for entry in g.memory_log[:64]:
+            g.ingest_memory_strip({"experience": entry["experience"], "tags": ["echo"]})
+        expected = _contents(g)
+        g.close_journal()
+        t = Hippocampus()
+        t.enable_tiering(os.path.join(tmp, "cold"), hot_limit=max(n // 8, 64), block_size=64)
+        tiered, _ = _timed(lambda: t.open_journal(path))
+        assert _contents(t) == expected, "tiered reopen lost merges into rolled-out entries"
+        t.close_journal()
+        t = Hippocampus()
+        t.load_from_disk(path)
+        t.set_core_memory("name", "name: Halcyon")
+        t.query_memory("name")
+        assert _contents(t) == expected, "reloaded log promoted 'name' twice"
+        print(f"[recovery] n={n:,} write={written:.2f}s  reopen={reopened:.2f}s  tiered_reopen={tiered:.2f}s  "
+              f"entries={len(expected):,}  merges={h.near_duplicate_counts['merge'] + g.near_duplicate_counts['merge']:,}  "
+              f"repeats={sum(e[3] - 1 for e in expected):,}")
+
+        seg_path = os.path.join(tmp, "log.hseg")
+        h.save_segment(seg_path)
+        s = Hippocampus()
+        s.load_segment(seg_path)
+        s._forget(s.memory_log[:len(s.memory_log) // 2])
+        kept, stamps = _contents(s), [e.epoch() for e in s.memory_log]
+        s.save_segment(seg_path)                     # over the file s is still mapped from
+        assert [e.epoch() for e in s.memory_log] == stamps, "segment entries changed under re-save"
+        t = Hippocampus()
+        t.load_segment(seg_path)
+        assert _contents(t) == kept
+        print(f"[recovery] n={n:,} segment re-save over its own mapping: {len(kept):,} entries intact")
+
+
+BENCHES = {
+    "references": bench_references,
+    "recall": bench_recall,
+    "cold_start": bench_cold_start,
+    "entry_bytes": bench_entry_bytes,
+    "bulk_ingest": bench_bulk_ingest,
+    "recall_cache": bench_recall_cache,
+    "tag_query": bench_tag_query,
+    "tiered": bench_tiered,
+    "save": bench_save,
+    "stress": bench_stress,
+    "strings": bench_strings,
+    "range": bench_range,
+    "related": bench_related,
+    "search": bench_search,
+    "near_duplicates": bench_near_duplicates,
+    "recovery": bench_recovery,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("names", nargs="*", default=list(BENCHES), help="benchmarks to run")
+    parser.add_argument("--n", type=int, default=1_000_000, help="memory entries to generate")
+    args = parser.parse_args()
+    for name in args.names:
+        BENCHES[name](args.n)
@@ -0,0 +1,76 @@
+# hippocampus_bitset.py
+"""
+Hippocampus Bitsets – per-tag sets of integer entry ids.
+Each bitset is split into fixed-size chunks held as Python ints; chunks with
+no bits set are dropped, so a sparse tag costs only the chunks it touches.
+Boolean queries AND/OR/NOT whole chunks at C speed and walk the surviving
+bits from the highest id down, stopping as soon as enough ids are found.
+"""
+
+CHUNK_SHIFT = 13                       # 8192 ids per chunk
+CHUNK_MASK = (1 << CHUNK_SHIFT) - 1
+
+
+class TagBitset:
+    __slots__ = ("chunks",)
+
+    def __init__(self):
+        self.chunks = {}                 # chunk number → int of its bits
+
+    def add(self, eid):
+        c = eid >> CHUNK_SHIFT
+        self.chunks[c] = self.chunks.get(c, 0) | (1 << (eid & CHUNK_MASK))
+
+    def discard(self, eid):
+        c = eid >> CHUNK_SHIFT
+        bits = self.chunks.get(c)
+        if bits:
+            bits &= ~(1 << (eid & CHUNK_MASK))
+            if bits:
+                self.chunks[c] = bits
+            else:
+                del self.chunks[c]
+
+    def __len__(self):
+        return sum(bits.bit_count() for bits in self.chunks.values())
+
+    def __bool__(self):
+        return bool(self.chunks)
+
+
+def select(all_of=(), any_of=(), none_of=(), universe=()):
+    """Yield ids in (AND all_of) & (OR any_of) & ~(OR none_of), highest first.
+    With neither all_of nor any_of, the candidates are OR(universe)."""
+    if all_of:
+        base = min(all_of, key=lambda b: len(b.chunks))
+        keys = base.chunks.keys()
+    else:
+        pool = any_of or universe
+        keys = set().union(*(b.chunks for b in pool))
+    for c in sorted(keys, reverse=True):
+        if all_of:
+            bits = -1
+            for b in all_of:
+                bits &= b.chunks.get(c, 0)
+                if not bits:
+                    break
+        else:
+            bits = 0
+            for b in pool:
+                bits |= b.chunks.get(c, 0)
+        if bits and any_of and all_of:
+            bits &= _union(any_of, c)
+        if bits and none_of:
+            bits &= ~_union(none_of, c)
+        base_id = c << CHUNK_SHIFT
+        while bits:
+            top = bits.bit_length() - 1
+            yield base_id + top
+            bits ^= 1 << top
+
+
+def _union(bitsets, c):
+    bits = 0
+    for b in bitsets:
+        bits |= b.chunks.get(c, 0)
+    return bits
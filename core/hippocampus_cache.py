@@ -0,0 +1,48 @@
+# hippocampus_cache.py
+"""
+Hippocampus Cache – LRU of read results stamped with a generation.
+A hit only counts when the stored generation matches the caller's current
+one, so writes never have to find and evict entries: bumping the tag's
+generation is enough to make its old results unreachable.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class RecallCache:
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize           # entries kept; 0 disables caching
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()    # key → (generation, result), least recent first
+        self._lock = threading.Lock()    # readers on several threads share one cache
+
+    def get(self, key, generation):
+        """Cached result for `key` at `generation`, or None."""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == generation:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+            return None
+
+    def put(self, key, generation, result):
+        if self.maxsize > 0:
+            with self._lock:
+                self._entries[key] = (generation, result)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries),
+                "maxsize": self.maxsize, "hit_rate": self.hits / lookups if lookups else 0.0}
@@ -0,0 +1,117 @@
+# hippocampus_core.py
+"""
+Hippocampus Core Memory – structured long-term labels with a substring index.
+CoreMemory is a plain dict to callers; every write also updates pre-lowercased
+n-gram indexes over labels and contents so queries never walk the whole dict.
+"""
+
+
+class NgramIndex:
+    """Every 1..n-gram of each key's lowercased text → keys holding it.
+    Queries up to n chars are a single lookup; longer ones intersect their
+    n-grams and verify the survivors."""
+
+    def __init__(self, n=3):
+        self.n = n
+        self.texts = {}                  # key → lowercased text
+        self.grams = {}                  # gram → {keys}
+
+    def add(self, key, text):
+        self.remove(key)
+        text = str(text).lower()
+        self.texts[key] = text
+        for gram in self._grams(text):
+            self.grams.setdefault(gram, set()).add(key)
+
+    def remove(self, key):
+        text = self.texts.pop(key, None)
+        if text is None:
+            return
+        for gram in self._grams(text):
+            keys = self.grams[gram]
+            keys.discard(key)
+            if not keys:
+                del self.grams[gram]
+
+    def search(self, query):
+        """Keys whose text contains `query` (already lowercased)."""
+        if not query:
+            return set(self.texts)
+        if len(query) <= self.n:
+            return set(self.grams.get(query, ()))
+        n = self.n
+        postings = sorted((self.grams.get(query[i:i + n], set()) for i in range(len(query) - n + 1)), key=len)
+        hits = set(postings[0])
+        for keys in postings[1:]:
+            if not hits:
+                break
+            hits &= keys
+        return {k for k in hits if query in self.texts[k]}
+
+    def clear(self):
+        self.texts.clear()
+        self.grams.clear()
+
+    def _grams(self, text):
+        return {text[i:i + k] for k in range(1, self.n + 1) for i in range(len(text) - k + 1)}
+
+
+class CoreMemory(dict):
+    """label → content dict that keeps its label/content indexes in step."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.labels = NgramIndex()
+        self.contents = NgramIndex()
+        self.rank = {}                   # label → insertion sequence, for stable ordering
+        self._seq = 0
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, label, content):
+        super().__setitem__(label, content)
+        if label not in self.rank:
+            self.rank[label] = self._seq
+            self._seq += 1
+            self.labels.add(label, label)
+        self.contents.add(label, content)
+
+    def __delitem__(self, label):
+        super().__delitem__(label)
+        self._unindex(label)
+
+    def update(self, *args, **kwargs):
+        for label, content in dict(*args, **kwargs).items():
+            self[label] = content
+
+    def setdefault(self, label, default=None):
+        if label not in self:
+            self[label] = default
+        return self[label]
+
+    def pop(self, label, *default):
+        if label in self:
+            self._unindex(label)
+        return super().pop(label, *default)
+
+    def popitem(self):
+        label, content = super().popitem()
+        self._unindex(label)
+        return label, content
+
+    def clear(self):
+        super().clear()
+        self.labels.clear()
+        self.contents.clear()
+        self.rank.clear()
+
+    def search(self, query):
+        """(score, label) hits for `query`: 0.5 per field (label, content) that contains it."""
+        q = query.lower()
+        in_label, in_content = self.labels.search(q), self.contents.search(q)
+        return [(0.5 * (label in in_label) + 0.5 * (label in in_content), label)
+                for label in in_label | in_content]
+
+    def _unindex(self, label):
+        self.labels.remove(label)
+        self.contents.remove(label)
+        self.rank.pop(label, None)
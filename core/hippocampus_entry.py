@@ -0,0 +1,131 @@
+# hippocampus_entry.py
+"""
+Hippocampus Entry – compact memory record.
+A slotted object holding an integer epoch timestamp (µs), the experience
+and an interned tuple of tag ids, read like the old {"timestamp",
+"experience", "tags"} dict so entry["tags"] / entry.get(...) callers keep
+working. Collapsed repeats of the same encode add a "repeats" key.
+"""
+
+from collections.abc import Mapping
+from datetime import datetime, timedelta, timezone
+import time
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_KEYS = ("timestamp", "experience", "tags")
+NO_CONTENT = "🧠 No content."
+
+# Process-wide tag interner: the same handful of tags repeat across millions of
+# entries, and so do whole tag sets — each distinct id tuple is stored once.
+_tag_names = []
+_tag_ids = {}
+_tag_sets = {}
+_named_sets = {}                       # tuple of tag names → interned id tuple
+
+
+def intern_tag(tag):
+    tid = _tag_ids.get(tag)
+    if tid is None:
+        tid = _tag_ids[tag] = len(_tag_names)
+        _tag_names.append(tag)
+    return tid
+
+
+def tag_name(tid):
+    return _tag_names[tid]
+
+
+def tag_id(tag):
+    """Interned id of `tag`, or None if no entry ever carried it."""
+    return _tag_ids.get(tag)
+
+
+def intern_tags(tags):
+    names = tuple(tags)
+    ids = _named_sets.get(names)
+    if ids is None:
+        ids = tuple(map(intern_tag, names))
+        ids = _named_sets[names] = _tag_sets.setdefault(ids, ids)
+    return ids
+
+
+class MemoryEntry(Mapping):
+    __slots__ = ("ts", "experience", "tag_ids", "eid", "doc", "repeats")   # eid/doc: bitset / search ids
+
+    def __init__(self, experience, tags=None, ts=None, repeats=1):
+        self.ts = time.time_ns() // 1000 if ts is None else ts    # µs since epoch, UTC
+        self.experience = experience if isinstance(experience, str) else as_text(experience)
+        self.tag_ids = intern_tags(tags or ())
+        self.repeats = repeats           # consecutive identical encodes folded into this entry
+
+    @classmethod
+    def from_dict(cls, data):
+        stamp = data.get("timestamp")
+        ts = None if stamp is None else parse_micros(stamp)
+        return cls(as_text(data.get("experience")), data.get("tags") or [], ts,
+                   data.get("repeats", 1))
+
+    @property
+    def tags(self):
+        return [_tag_names[i] for i in self.tag_ids]
+
+    @property
+    def timestamp(self):
+        return (_EPOCH + timedelta(microseconds=self.ts)).isoformat()
+
+    def epoch(self):
+        return self.ts / 1_000_000
+
+    def to_dict(self):
+        data = {"timestamp": self.timestamp, "experience": self.experience, "tags": self.tags}
+        if self.repeats > 1:
+            data["repeats"] = self.repeats
+        return data
+
+    # ---------- MAPPING ----------
+    def __getitem__(self, key):
+        if key == "experience":
+            return self.experience
+        if key == "tags":
+            return self.tags
+        if key == "timestamp":
+            return self.timestamp
+        if key == "repeats" and self.repeats > 1:
+            return self.repeats
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(_KEYS if self.repeats == 1 else _KEYS + ("repeats",))
+
+    def __len__(self):
+        return len(_KEYS) + (self.repeats > 1)
+
+    def __repr__(self):
+        return f"MemoryEntry({self.to_dict()!r})"
+
+
+def as_text(experience):
+    """Stored form of an experience: dumps and callers have handed in None,
+    dicts and lists, which the term scans and the string table can't take."""
+    if isinstance(experience, str):
+        return experience
+    return NO_CONTENT if experience is None else str(experience)
+
+
+def parse_micros(stamp):
+    """Epoch microseconds for a datetime, ISO string or epoch seconds. Naive
+    times are UTC; unparseable stamps count as 'now'."""
+    if isinstance(stamp, (int, float)):
+        return round(stamp * 1_000_000)
+    try:
+        dt = stamp if isinstance(stamp, datetime) else datetime.fromisoformat(stamp)
+    except (TypeError, ValueError):
+        return time.time_ns() // 1000
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return (dt - _EPOCH) // _MICROSECOND
+
+
+def parse_epoch(stamp):
+    return parse_micros(stamp) / 1_000_000
@@ -0,0 +1,119 @@
+# hippocampus_graph.py
+"""
+Hippocampus Graph – sparse tag co-occurrence counts for associative recall.
+Every write adds its entry's weight to each pair of tags it carries, so
+"what goes with identity" is a top-k over one small row instead of a scan.
+
+Memory is bounded per tag: a row that outgrows `max_neighbors` keeps only
+its heaviest three quarters. With a `half_life`, an entry stamped t weighs
+2^((t - origin) / half_life): newer co-occurrences outweigh old ones without
+ever touching the old weights, since ranking by count or PMI only compares
+weights that share the same scale. The origin moves up (rescaling every
+weight once) before the numbers overflow.
+"""
+
+import heapq
+import math
+import time
+from operator import itemgetter
+
+_weight_of = itemgetter(1)
+_REBASE = 2.0 ** 512                     # largest entry weight before the origin moves up
+
+
+class TagGraph:
+    def __init__(self, max_neighbors=256, half_life=None):
+        self.max_neighbors = max_neighbors
+        self.half_life = half_life       # seconds; None counts every write as 1
+        self.rows = {}                   # tag → {neighbour: weight of entries carrying both}
+        self.totals = {}                 # tag → weight of entries carrying it
+        self.total = 0.0                 # weight of every entry added
+        self._origin = None              # epoch seconds where an entry weighs 1 (half_life mode)
+
+    def add(self, tags, t, count=1):
+        """Count an entry stamped `t` (epoch seconds) carrying `tags`, `count` times."""
+        w = count * self._weight(t)
+        self.total += w
+        totals = self.totals
+        for tag in tags:
+            totals[tag] = totals.get(tag, 0.0) + w
+        if len(tags) < 2:
+            return
+        for a in tags:
+            row = self.rows.get(a)
+            if row is None:
+                row = self.rows[a] = {}
+            for b in tags:
+                if b != a:
+                    row[b] = row.get(b, 0.0) + w
+            if len(row) > self.max_neighbors:
+                # Swap in a trimmed copy: readers never see a half-trimmed row.
+                self.rows[a] = dict(heapq.nlargest(self.max_neighbors * 3 // 4, row.items(), key=_weight_of))
+
+    def extend(self, tags, added, t, count=1):
+        """An entry already counted with `tags` now also carries `added`:
+        count only the pairs that involve a new tag."""
+        w = count * self._weight(t)
+        totals, fresh = self.totals, set(added)
+        for tag in added:
+            totals[tag] = totals.get(tag, 0.0) + w
+        carried = list(tags) + list(added)
+        if len(carried) < 2:
+            return
+        for a in carried:
+            row = self.rows.get(a)
+            if row is None:
+                row = self.rows[a] = {}
+            for b in (carried if a in fresh else added):
+                if b != a:
+                    row[b] = row.get(b, 0.0) + w
+            if len(row) > self.max_neighbors:
+                self.rows[a] = dict(heapq.nlargest(self.max_neighbors * 3 // 4, row.items(), key=_weight_of))
+
+    def related(self, tag, k=5, by="count"):
+        """Top-k (neighbour, score) of `tag`. "count" scores the co-occurrence
+        weight, decayed to now; "pmi" scores log(p(a, b) / (p(a) p(b)))."""
+        row = self.rows.get(tag)
+        if not row or k <= 0:
+            return []
+        items = list(row.items())        # one C-level copy; the writer may be adding
+        if by == "count":
+            scale = self._scale(time.time())
+            return [(b, w * scale) for b, w in heapq.nlargest(k, items, key=_weight_of)]
+        if by == "pmi":
+            n, totals = self.total, self.totals
+            base = totals.get(tag, 0.0)
+            scored = [(b, math.log(w * n / (base * totals[b]))) for b, w in items
+                      if w > 0 and base > 0 and totals.get(b, 0.0) > 0]
+            return heapq.nlargest(k, scored, key=_weight_of)
+        raise ValueError(f"Unknown ranking {by!r}; use 'count' or 'pmi'")
+
+    def stats(self):
+        return {"tags": len(self.totals), "rows": len(self.rows),
+                "pairs": sum(len(row) for row in self.rows.values()),
+                "max_neighbors": self.max_neighbors, "half_life": self.half_life}
+
+    # ---------- INTERNAL ----------
+    def _weight(self, t):
+        if self.half_life is None:
+            return 1.0
+        if self._origin is None:
+            self._origin = t
+        w = 2.0 ** ((t - self._origin) / self.half_life)
+        if w > _REBASE:
+            self._rebase(t)
+            w = 1.0
+        return w
+
+    def _scale(self, now):
+        # Weights are relative to the origin; this turns them into "as of now" counts.
+        if self.half_life is None or self._origin is None:
+            return 1.0
+        return 2.0 ** ((self._origin - now) / self.half_life)
+
+    def _rebase(self, t):
+        factor = 2.0 ** ((self._origin - t) / self.half_life)
+        self._origin = t
+        self.total *= factor
+        self.totals = {tag: w * factor for tag, w in self.totals.items()}
+        self.rows = {a: {b: w * factor for b, w in row.items()} for a, row in self.rows.items()}
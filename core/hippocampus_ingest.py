@@ -0,0 +1,58 @@
+# hippocampus_ingest.py
+"""
+Hippocampus Ingest – streaming readers for memory strip files.
+Yields one strip at a time from a JSON array, JSONL, or a run of
+concatenated JSON objects, holding at most a chunk of the file in memory.
+Feed the generator to Hippocampus.ingest_memory_strips.
+"""
+
+import json
+
+CHUNK_CHARS = 1 << 20
+
+
+def read_strips(path, chunk_chars=CHUNK_CHARS):
+    with open(path, "r", encoding="utf-8") as f:
+        yield from iter_strips(f, chunk_chars)
+
+
+def iter_strips(f, chunk_chars=CHUNK_CHARS):
+    """Decode JSON values from a text stream: the items of a top-level array,
+    or each value of a JSONL / concatenated-JSON stream."""
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+    in_array = None
+
+    while True:
+        # Skip separators; pull more text whenever the buffer runs dry.
+        while True:
+            while pos < len(buf) and (buf[pos].isspace() or (in_array and buf[pos] == ",")):
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            buf, pos = buf[pos:] + f.read(chunk_chars), 0
+            eof = pos == len(buf)
+        if pos >= len(buf):
+            return
+        if in_array is None:
+            in_array = buf[pos] == "["
+            if in_array:
+                pos += 1
+            continue
+        if in_array and buf[pos] == "]":
+            return
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+            if end == len(buf) and not eof:
+                raise ValueError("value may continue in the next chunk")
+        except ValueError:
+            if eof:
+                raise
+            more = f.read(chunk_chars)
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+        pos = end
+        yield value
+        if pos > chunk_chars:
+            buf, pos = buf[pos:], 0
@@ -0,0 +1,260 @@
+# hippocampus_journal.py
+"""
+Hippocampus Journal – append-only write-ahead log for the memory log.
+Every write lands as one JSONL record in the active segment; compaction
+folds closed segments into a checkpoint on a background thread, and
+recovery loads the newest checkpoint then replays the segments after it.
+
+On-disk layout next to `path`:
+    path                      legacy full JSON dump (read if no checkpoint, or if
+                              written after every journal file)
+    path.ckpt-000007          checkpoint covering segments <= 7 (JSONL entries)
+    path.wal-000008.jsonl     segments written since that checkpoint
+
+Within one checkpoint or segment file an experience text is written once:
+the first entry carrying it stores it with an id ("text": n), later entries
+store only the id.
+"""
+
+import json
+import os
+import re
+import threading
+import zlib
+
+
+class MemoryJournal:
+    def __init__(self, path="hippocampus_log.json", fsync=False, compact_bytes=64 * 1024 * 1024):
+        self.path = path
+        self.fsync = fsync                  # fsync every append (power-loss safe) vs. flush only
+        self.compact_bytes = compact_bytes  # journal size that triggers auto-compaction
+        self.bytes_since_checkpoint = 0
+        self._dir = os.path.dirname(os.path.abspath(path))
+        self._base = os.path.basename(path)
+        self._lock = threading.Lock()
+        self._compactor = None
+        self._segment = None
+        self._fh = None
+        self._refs = None                   # _TextRefs of the active segment
+        self.base_crc = None                # CRC-32 / bytes of the legacy dump, when recovery read one
+        self.base_size = None
+        self.superseded = False             # recovery found a dump newer than the journal files
+
+    # ---------- RECOVERY ----------
+    def recover(self):
+        """Return (entries, records): checkpoint entries plus the journal
+        records written after it, in order. Call before open()."""
+        ckpts, segs = self._numbered("ckpt"), self._numbered("wal")
+        if (ckpts or segs) and self._dump_is_newest(ckpts, segs):
+            # A plain save_to_disk after the journal was closed: the dump holds everything.
+            self.superseded = True
+            self._segment = max(ckpts + segs)
+            return self._read_dump(), []
+        if ckpts:
+            covered = ckpts[-1]
+            refs = _TextRefs()
+            entries = [refs.unpack(e) for e in self._read_jsonl(self._ckpt_path(covered))]
+        else:
+            covered = 0
+            entries = self._read_dump() if os.path.exists(self.path) else []
+        records = []
+        for seg in self._numbered("wal"):
+            if seg > covered:
+                seg_path = self._seg_path(seg)
+                refs = _TextRefs()
+                for record in self._read_jsonl(seg_path, repair=True):
+                    if record.get("op") == "add" and isinstance(record.get("entry"), dict):
+                        refs.unpack(record["entry"])
+                    records.append(record)
+                self.bytes_since_checkpoint += os.path.getsize(seg_path)
+        self._segment = max([covered] + self._numbered("wal"))
+        return entries, records
+
+    def open(self):
+        """Start a fresh active segment after everything already on disk."""
+        with self._lock:
+            if self._segment is None:
+                self._segment = max([0] + self._numbered("ckpt") + self._numbered("wal"))
+            self._open_next()
+
+    # ---------- WRITE ----------
+    def append(self, *records):
+        """Append records as one write (a bulk ingest lands as a single batch)."""
+        refs = self._refs
+        lines = "".join(json.dumps({"op": "add", "entry": refs.pack(r["entry"])} if r.get("op") == "add" else r,
+                                   ensure_ascii=False, default=_plain) + "\n" for r in records)
+        with self._lock:
+            self._fh.write(lines)
+            self._fh.flush()
+            if self.fsync:
+                os.fsync(self._fh.fileno())
+            self.bytes_since_checkpoint += len(lines)
+
+    def flush(self, sync=True):
+        with self._lock:
+            if self._fh:
+                self._fh.flush()
+                if sync:
+                    os.fsync(self._fh.fileno())
+
+    def should_compact(self):
+        return self.bytes_since_checkpoint >= self.compact_bytes and not self.compacting()
+
+    def compacting(self):
+        return self._compactor is not None and self._compactor.is_alive()
+
+    # ---------- COMPACTION ----------
+    def rotate(self):
+        """Close the active segment and start the next one. Returns the id of
+        the last closed segment; a snapshot taken now covers it exactly."""
+        with self._lock:
+            covered = self._segment
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+            self._fh.close()
+            self._open_next()
+            self.bytes_since_checkpoint = 0
+            return covered
+
+    def compact(self, entries, covered, wait=False):
+        """Write `entries` as the checkpoint for segments <= `covered`, then drop them."""
+        if self.compacting():
+            return False
+        self._compactor = threading.Thread(target=self._write_checkpoint, args=(entries, covered),
+                                           name="HippocampusCompactor", daemon=True)
+        self._compactor.start()
+        if wait:
+            self._compactor.join()
+        return True
+
+    def wait(self):
+        if self._compactor is not None:
+            self._compactor.join()
+
+    def close(self):
+        self.wait()
+        with self._lock:
+            if self._fh:
+                self._fh.flush()
+                os.fsync(self._fh.fileno())
+                self._fh.close()
+                self._fh = None
+
+    # ---------- INTERNAL ----------
+    def _write_checkpoint(self, entries, covered):
+        final = self._ckpt_path(covered)
+        tmp = final + ".tmp"
+        refs = _TextRefs()
+        with open(tmp, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(refs.pack(entry), ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, final)
+        # The checkpoint is durable; older checkpoints and covered segments are garbage.
+        for ckpt in self._numbered("ckpt"):
+            if ckpt < covered:
+                os.remove(self._ckpt_path(ckpt))
+        for seg in self._numbered("wal"):
+            if seg <= covered:
+                os.remove(self._seg_path(seg))
+
+    def _read_dump(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+        self.base_crc, self.base_size = zlib.crc32(data), len(data)
+        return json.loads(data)
+
+    def _dump_is_newest(self, ckpts, segs):
+        try:
+            dumped = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return False
+        for path in [self._ckpt_path(n) for n in ckpts] + [self._seg_path(n) for n in segs]:
+            try:
+                if os.stat(path).st_mtime_ns >= dumped:
+                    return False
+            except FileNotFoundError:
+                continue
+        return True
+
+    def _open_next(self):
+        self._segment += 1
+        self._fh = open(self._seg_path(self._segment), "a", encoding="utf-8")
+        self._refs = _TextRefs()
+
+    def _numbered(self, kind):
+        if kind == "ckpt":
+            pattern = re.compile(re.escape(self._base) + r"\.ckpt-(\d+)$")
+        else:
+            pattern = re.compile(re.escape(self._base) + r"\.wal-(\d+)\.jsonl$")
+        try:
+            names = os.listdir(self._dir)
+        except FileNotFoundError:
+            return []
+        return sorted(int(m.group(1)) for m in map(pattern.match, names) if m)
+
+    def _ckpt_path(self, n):
+        return os.path.join(self._dir, f"{self._base}.ckpt-{n:06d}")
+
+    def _seg_path(self, n):
+        return os.path.join(self._dir, f"{self._base}.wal-{n:06d}.jsonl")
+
+    @staticmethod
+    def _read_jsonl(path, repair=False):
+        out = []
+        with open(path, "rb") as f:
+            data = f.read()
+        offset = 0
+        for raw in data.splitlines(keepends=True):
+            try:
+                if raw.strip():
+                    out.append(json.loads(raw))
+            except json.JSONDecodeError:
+                if repair and offset + len(raw) == len(data):
+                    # Torn tail from a crash mid-append: drop it so the file stays clean.
+                    with open(path, "r+b") as f:
+                        f.truncate(offset)
+                    print(f"[Hippocampus] Dropped torn journal tail in {os.path.basename(path)}.")
+                    break
+                print(f"[⚠️] Skipped corrupt journal record in {os.path.basename(path)} @ {offset}.")
+            offset += len(raw)
+        return out
+
+
+class _TextRefs:
+    """Experience texts seen so far in one file, by id."""
+
+    def __init__(self):
+        self.ids = {}                       # text → id, while writing
+        self.texts = {}                     # id → text, while reading
+
+    def pack(self, entry):
+        data = dict(entry if isinstance(entry, dict) else _plain(entry))   # segment entries cache theirs
+        text = data.get("experience")
+        if isinstance(text, str):
+            ref = self.ids.get(text)
+            if ref is None:
+                data["text"] = self.ids[text] = len(self.ids)
+            else:
+                del data["experience"]
+                data["text"] = ref
+        return data
+
+    def unpack(self, data):
+        ref = data.pop("text", None)
+        if ref is not None:
+            if "experience" in data:
+                self.texts[ref] = data["experience"]
+            elif ref in self.texts:
+                data["experience"] = self.texts[ref]
+            else:
+                print(f"[⚠️] Journal entry refers to unknown text #{ref}; its defining record was lost.")
+        return data
+
+
+def _plain(obj):
+    # json default hook: lazily loaded entries know how to become dicts.
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,157 @@
+# hippocampus_minhash.py
+"""
+Hippocampus MinHash – near-duplicate lookup for ingested strips.
+A text is read as its set of character 4-grams (lowercased, whitespace
+collapsed). Its sketch keeps, in each of `num_perm` slots, the smallest hash
+landing there (one-permutation MinHash: one hash per shingle, empty slots
+borrow from their neighbour), and the sketch is cut into bands of `rows`
+slots. Two texts with Jaccard similarity s share a band with probability
+1 - (1 - s^rows)^bands; bands and rows are picked so that curve rises just
+below the threshold (a pair right at it is found 80-90% of the time).
+Each band bucket keeps only its newest few entries, so a lookup touches
+at most bands × bucket_cap candidates, and a candidate is confirmed by
+exact Jaccard before it counts as a duplicate.
+
+Band keys use the interpreter's string hash: they are only valid within one
+process, and the index is rebuilt from the hot log rather than saved.
+"""
+
+SHINGLE = 4                              # characters per shingle
+_RECENT = 256                            # candidate shingle sets kept for reuse
+_OFFSET = 1 << 64                        # keeps borrowed slot values apart from real hashes
+
+
+def shingles(text):
+    norm = " ".join(text.lower().split())
+    if len(norm) <= SHINGLE:
+        return {norm}
+    return {norm[i:i + SHINGLE] for i in range(len(norm) - SHINGLE + 1)}
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    common = len(a & b)
+    return common / (len(a) + len(b) - common)
+
+
+def _bands(threshold, num_perm, miss_weight=0.9, steps=50):
+    """(bands, rows) with bands × rows <= num_perm whose S-curve best separates
+    pairs below `threshold` from pairs above it. Candidates are confirmed
+    exactly, so a stray candidate only costs a check while a missed pair keeps
+    a near-copy: misses weigh `miss_weight`, strays the rest."""
+    def collide(s, bands, rows):
+        return 1 - (1 - s ** rows) ** bands
+
+    best, best_cost = (1, num_perm), None
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            below = sum(collide(threshold * (i + 0.5) / steps, bands, rows) for i in range(steps)) * threshold
+            above = sum(1 - collide(threshold + (1 - threshold) * (i + 0.5) / steps, bands, rows)
+                        for i in range(steps)) * (1 - threshold)
+            cost = (1 - miss_weight) * below + miss_weight * above
+            if best_cost is None or cost < best_cost:
+                best, best_cost = (bands, rows), cost
+    return best
+
+
+class NearDuplicateIndex:
+    def __init__(self, threshold=0.9, num_perm=64, bucket_cap=8):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bucket_cap = bucket_cap     # newest entries kept per band bucket
+        self.bands, self.rows = _bands(threshold, num_perm)
+        self.buckets = {}                # band key → entries, oldest first
+        self.entries = 0
+        self.lookups = 0
+        self.candidates = 0              # exact Jaccard checks run by lookups
+        self.matches = 0
+        self._recent = {}                # text → shingles of recently checked candidates
+
+    def keys(self, text, grams=None):
+        """Band keys of `text` (one per band); `grams` are its shingles if
+        already at hand."""
+        num_perm = self.num_perm
+        # Hashes largest first, so each slot ends up holding its smallest.
+        mins = {h % num_perm: h for h in sorted(map(hash, grams or shingles(text)), reverse=True)}
+        slots = [mins.get(i) for i in range(num_perm)]
+        if len(mins) < num_perm:
+            # Densify: an empty slot takes the next filled one to its right, offset by the distance.
+            nxt = min(mins) + num_perm
+            for i in range(num_perm - 1, -1, -1):
+                if slots[i] is None:
+                    slots[i] = slots[nxt % num_perm] + (nxt - i) * _OFFSET
+                else:
+                    nxt = i
+        rows = self.rows
+        return [hash((band, tuple(slots[band * rows:(band + 1) * rows]))) for band in range(self.bands)]
+
+    def find(self, text, grams, keys):
+        """An indexed entry at least `threshold` similar to `text` (shingles
+        `grams`, band `keys`), or None. Candidates sharing the most bands are
+        confirmed first; an identical text needs no shingling."""
+        self.lookups += 1
+        shared, held = {}, {}
+        for key in keys:
+            for entry in self.buckets.get(key, ()):
+                shared[id(entry)] = shared.get(id(entry), 0) + 1
+                held[id(entry)] = entry
+        if not shared:
+            return None
+        checked = set()
+        for eid in sorted(shared, key=shared.__getitem__, reverse=True):
+            entry = held[eid]
+            other = entry["experience"]
+            if other in checked:
+                continue
+            checked.add(other)
+            self.candidates += 1
+            if other == text or jaccard(grams, self._shingles(other)) >= self.threshold:
+                self.matches += 1
+                return entry
+        return None
+
+    def add(self, entry, keys=None):
+        if keys is None:
+            keys = self.keys(entry["experience"])
+        buckets, cap = self.buckets, self.bucket_cap
+        for key in keys:
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = [entry]
+            else:
+                bucket.append(entry)
+                if len(bucket) > cap:
+                    del bucket[0]
+        self.entries += 1
+
+    def remove(self, entry, keys=None):
+        if keys is None:
+            keys = self.keys(entry["experience"])
+        buckets = self.buckets
+        for key in keys:
+            bucket = buckets.get(key)
+            if bucket is None:
+                continue
+            for i, held in enumerate(bucket):
+                if held is entry:
+                    del bucket[i]
+                    if not bucket:
+                        del buckets[key]
+                    break
+        self.entries -= 1
+
+    def _shingles(self, text):
+        # Re-pasted blocks match the same few stored texts again and again.
+        grams = self._recent.pop(text, None)
+        if grams is None:
+            grams = shingles(text)
+            if len(self._recent) >= _RECENT:
+                del self._recent[next(iter(self._recent))]
+        self._recent[text] = grams
+        return grams
+
+    def stats(self):
+        return {"entries": self.entries, "buckets": len(self.buckets), "bands": self.bands,
+                "rows": self.rows, "threshold": self.threshold, "lookups": self.lookups,
+                "candidates": self.candidates, "matches": self.matches}
@@ -0,0 +1,269 @@
+# hippocampus_search.py
+"""
+Hippocampus Search – BM25-ranked full-text index over experiences.
+Each hot entry gets a doc id; every lowercased word of its text maps to its
+postings: ascending doc ids and term frequencies, plus per-block bounds (the
+highest tf and shortest doc in each run of BLOCK postings). A word seen in a
+single doc is stored as just that doc id. Removal only tombstones the doc
+(the owner renumbers once most ids are dead).
+
+Searches run without the writer lock: the index only grows, and each
+Postings publishes its count after a posting is complete, so a reader
+walks a prefix whose ids, tfs and bounds are all in place.
+
+Queries run document-at-a-time from the newest doc down (MaxScore): once
+the top k are full, words whose best possible contribution cannot lift a doc
+past the k-th score stop producing candidates, and blocks whose bound falls
+short are skipped whole — so "I am Halcyon" over a million entries stops
+after the first few docs instead of scoring every one of them.
+"""
+
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+
+BLOCK = 64                               # postings per block bound
+_WORD = re.compile(r"\w+")
+_TIE = 1e-12                             # relative slack: bounds this close to the k-th score cannot beat it
+
+
+def tokenize(text):
+    return _WORD.findall(text.lower())
+
+
+class Postings:
+    __slots__ = ("ids", "tfs", "block_tf", "block_len", "max_tf", "min_len", "count")
+
+    def __init__(self):
+        self.ids = array("I")            # doc ids, ascending
+        self.tfs = array("H")            # term frequency per doc
+        self.block_tf = array("H")       # per block: highest tf
+        self.block_len = array("I")      # per block: shortest doc length
+        self.max_tf = 0
+        self.min_len = 0xFFFFFFFF
+        self.count = 0                   # complete postings; readers never look past it
+
+    def append(self, doc, tf, length):
+        if len(self.ids) % BLOCK:
+            if tf > self.block_tf[-1]:
+                self.block_tf[-1] = tf
+            if length < self.block_len[-1]:
+                self.block_len[-1] = length
+        else:
+            self.block_tf.append(tf)
+            self.block_len.append(length)
+        self.ids.append(doc)
+        self.tfs.append(tf)
+        if tf > self.max_tf:
+            self.max_tf = tf
+        if length < self.min_len:
+            self.min_len = length
+        self.count += 1
+
+
+class SearchIndex:
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1                     # term-frequency saturation
+        self.b = b                       # document-length normalization
+        self.docs = []                   # doc id → entry (None once removed)
+        self.lengths = array("I")        # doc id → words in its text
+        self.postings = {}               # term → Postings, or a bare doc id while only one doc has it
+        self.df = {}                     # term → live docs containing it
+        self.live = 0
+        self.dead = 0                    # tombstoned doc ids
+        self.total_length = 0            # words over live docs
+
+    def add(self, entry, text):
+        doc = len(self.docs)
+        entry.doc = doc
+        words = tokenize(text)
+        length = len(words)
+        self.docs.append(entry)
+        self.lengths.append(length)
+        self.live += 1
+        self.total_length += length
+        counts = {}
+        for word in words:
+            counts[word] = counts.get(word, 0) + 1
+        postings, df = self.postings, self.df
+        for term, tf in counts.items():
+            posting = postings.get(term)
+            if posting is None and tf == 1:
+                postings[term] = doc
+                df[term] = 1
+                continue
+            if type(posting) is not Postings:
+                single, posting = posting, Postings()
+                if single is not None:
+                    posting.append(single, 1, self.lengths[single])
+                postings[term] = posting
+            posting.append(doc, min(tf, 0xFFFF), length)
+            df[term] = df.get(term, 0) + 1
+
+    def remove(self, entry, text):
+        doc = getattr(entry, "doc", None)
+        if doc is None or doc >= len(self.docs) or self.docs[doc] is not entry:
+            return
+        self.docs[doc] = None
+        self.live -= 1
+        self.dead += 1
+        self.total_length -= self.lengths[doc]
+        for term in set(tokenize(text)):
+            left = self.df[term] - 1
+            if left:
+                self.df[term] = left
+            else:
+                del self.df[term]
+                del self.postings[term]
+
+    def search(self, query, top_k=5, accept=None):
+        """[(entry, score)] for the `top_k` best BM25 matches of `query`,
+        best first (ties: newest first). `accept(entry)` filters candidates."""
+        df, n = self.df, self.live
+        terms = {t for t in tokenize(query) if t in df}
+        if not terms or top_k <= 0 or not n:
+            return []
+        avg = self.total_length / n or 1.0
+        k1, b = self.k1, self.b
+        docs, lengths = self.docs, self.lengths
+
+        # Per term, ordered by its best possible contribution (ub), smallest first.
+        plan = []
+        for term in terms:
+            # A concurrent remove may drop the term between these reads.
+            posting, count = self.postings.get(term), df.get(term)
+            if posting is None or count is None:
+                continue
+            if type(posting) is int:
+                ids, tfs, block_tf, block_len = (posting,), (1,), (1,), (lengths[posting],)
+                max_tf, min_len, size = 1, lengths[posting], 1
+            else:
+                size = posting.count     # read first: everything below it is complete
+                ids, tfs, block_tf, block_len = posting.ids, posting.tfs, posting.block_tf, posting.block_len
+                max_tf, min_len = posting.max_tf, posting.min_len
+            lift = math.log(1 + (n - count + 0.5) / (count + 0.5)) * (k1 + 1)
+            ub = lift * max_tf / (max_tf + k1 * (1 - b + b * min_len / avg))
+            plan.append((ub, lift, ids, tfs, block_tf, block_len, size))
+        plan.sort(key=lambda p: p[0])
+        m = len(plan)
+        ubs = [p[0] for p in plan]
+        lifts = [p[1] for p in plan]
+        ids = [p[2] for p in plan]
+        tfs = [p[3] for p in plan]
+        block_tf = [p[4] for p in plan]
+        block_len = [p[5] for p in plan]
+        pos = [p[6] - 1 for p in plan]   # cursors walk from the newest doc down
+        prefix = [0.0]                   # prefix[i] = ub of terms 0..i-1
+        for ub in ubs:
+            prefix.append(prefix[-1] + ub)
+
+        heap, full, bar, ne = [], False, 0.0, 0   # terms below `ne` cannot open candidates
+        allowed, allowed_from = None, 0          # docs of the current block that can still pass
+        while True:
+            d = -1
+            for t in range(ne, m):
+                p = pos[t]
+                if p >= 0 and ids[t][p] > d:
+                    d = ids[t][p]
+            if d < 0:
+                break
+            if allowed is not None:
+                if pos[ne] >= allowed_from:
+                    if d not in allowed:
+                        pos[ne] -= 1
+                        continue
+                else:
+                    allowed = None
+            if full and ne == m - 1 and allowed is None:
+                # One term left producing candidates: judge its current block as a whole.
+                p = pos[ne]
+                j = p // BLOCK
+                start = j * BLOCK
+                tf, length = block_tf[ne][j], block_len[ne][j]
+                bound = lifts[ne] * tf / (tf + k1 * (1 - b + b * length / avg))
+                if bound + prefix[ne] <= bar:
+                    pos[ne] = start - 1
+                    continue
+                if bound <= bar:
+                    # Its docs need the other terms to pass the k-th score: any term the rest
+                    # cannot do without is required, so intersect with their ids (C-level sets).
+                    need, block = bar - bound, ids[ne][start:p + 1]
+                    lo, hi = block[0], block[-1]
+                    keep, union, required = set(block), set(), False
+                    for t in range(ne):
+                        q = pos[t] + 1
+                        window = ids[t][bisect_left(ids[t], lo, 0, q):bisect_right(ids[t], hi, 0, q)]
+                        if prefix[ne] - ubs[t] <= need:
+                            keep.intersection_update(window)
+                            required = True
+                        else:
+                            union.update(window)
+                    if not required:
+                        keep &= union
+                    if not keep:
+                        pos[ne] = start - 1
+                        continue
+                    allowed, allowed_from = keep, start
+                    if d not in allowed:
+                        pos[ne] -= 1
+                        continue
+            elif full:
+                # Block bound: the most d could score.
+                bound = prefix[ne]
+                for t in range(ne, m):
+                    p = pos[t]
+                    if p >= 0 and ids[t][p] == d:
+                        j = p // BLOCK
+                        tf, length = block_tf[t][j], block_len[t][j]
+                        bound += lifts[t] * tf / (tf + k1 * (1 - b + b * length / avg))
+                if bound <= bar:
+                    if ne == m - 1:
+                        pos[ne] = pos[ne] // BLOCK * BLOCK - 1
+                    else:
+                        for t in range(ne, m):
+                            p = pos[t]
+                            if p >= 0 and ids[t][p] == d:
+                                pos[t] = p - 1
+                    continue
+            entry = docs[d]
+            ok = entry is not None and (accept is None or accept(entry))
+            score, length = 0.0, lengths[d]
+            for t in range(ne, m):
+                p = pos[t]
+                if p >= 0 and ids[t][p] == d:
+                    if ok:
+                        tf = tfs[t][p]
+                        score += lifts[t] * tf / (tf + k1 * (1 - b + b * length / avg))
+                    pos[t] = p - 1
+            if not ok:
+                continue
+            for t in range(ne - 1, -1, -1):
+                if full and score + prefix[t + 1] <= bar:
+                    break
+                p = pos[t]
+                if p < 0:
+                    continue
+                j = bisect_right(ids[t], d, 0, p + 1) - 1
+                if j >= 0 and ids[t][j] == d:
+                    tf = tfs[t][j]
+                    score += lifts[t] * tf / (tf + k1 * (1 - b + b * length / avg))
+                    j -= 1
+                pos[t] = j
+            if not full:
+                heapq.heappush(heap, (score, d))
+                full = len(heap) == top_k
+            elif score > heap[0][0]:
+                heapq.heapreplace(heap, (score, d))
+            else:
+                continue
+            if full:
+                bar = heap[0][0] * (1 + _TIE)
+                while ne < m and prefix[ne + 1] <= bar:
+                    ne += 1
+        return [(docs[d], score) for score, d in sorted(heap, reverse=True)]
+
+    def stats(self):
+        return {"docs": self.live, "dead": self.dead, "terms": len(self.df),
+                "postings": sum(1 if type(p) is int else p.count for p in self.postings.values())}
@@ -0,0 +1,174 @@
+# hippocampus_segment.py
+"""
+Hippocampus Segment – memory-mapped, read-only snapshot of the memory log.
+Fixed-width columns (offsets, packed timestamps, interned tag ids and
+per-tag postings) are read straight out of the mmap; an entry's JSON is
+only decoded when somebody actually reads it.
+
+Layout: MAGIC | u64 meta length | meta JSON | 8-byte aligned sections.
+"""
+
+import json
+import mmap
+import os
+import sys
+from array import array
+from collections.abc import Mapping
+
+MAGIC = b"HSEG\x01\x00\x00\x00"
+
+# section name → array typecode
+_COLUMNS = {
+    "times": "d",       # epoch seconds per row
+    "blob_off": "Q",    # row → byte offset of its JSON blob (n + 1 entries)
+    "tag_off": "I",     # row → offset into tag_ids (n + 1 entries)
+    "tag_ids": "I",     # interned tag id per (row, tag)
+    "post_off": "Q",    # tag id → offset into postings (T + 1 entries)
+    "postings": "I",    # rows per tag, time-ordered
+    "post_times": "d",  # epoch seconds parallel to postings
+}
+
+
+def is_segment(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def write_segment(path, entries, times, buckets, bucket_times, term_counts=None):
+    """Write `entries` (row order) with their epoch `times`. `buckets` maps
+    tag → time-ordered entries drawn from `entries`; `bucket_times` holds the
+    matching epoch arrays."""
+    row_of = {id(e): r for r, e in enumerate(entries)}
+    tags = list(buckets)
+    tag_id = {t: i for i, t in enumerate(tags)}
+
+    cols = {name: array(code) for name, code in _COLUMNS.items()}
+    cols["times"].extend(times)
+    blobs = bytearray()
+    cols["blob_off"].append(0)
+    cols["tag_off"].append(0)
+    for entry in entries:
+        blobs += json.dumps(_plain_entry(entry), ensure_ascii=False).encode("utf-8")
+        cols["blob_off"].append(len(blobs))
+        cols["tag_ids"].extend(tag_id[t] for t in entry["tags"])
+        cols["tag_off"].append(len(cols["tag_ids"]))
+    cols["post_off"].append(0)
+    for tag in tags:
+        for entry, t in zip(buckets[tag], bucket_times[tag]):
+            row = row_of.get(id(entry))
+            if row is not None:
+                cols["postings"].append(row)
+                cols["post_times"].append(t)
+        cols["post_off"].append(len(cols["postings"]))
+
+    sections = [(name, cols[name].tobytes()) for name in _COLUMNS] + [("blobs", bytes(blobs))]
+    meta = {"count": len(entries), "tags": tags, "terms": dict(term_counts or {}),
+            "byteorder": sys.byteorder, "sections": {}}
+    # Section offsets live in the meta, so iterate until its length settles.
+    raw_meta = b""
+    while True:
+        offset = _align(len(MAGIC) + 8 + len(raw_meta))
+        for name, data in sections:
+            meta["sections"][name] = [offset, len(data)]
+            offset = _align(offset + len(data))
+        encoded = json.dumps(meta).encode("utf-8")
+        if len(encoded) == len(raw_meta):
+            raw_meta = encoded
+            break
+        raw_meta = encoded
+
+    # Entries of a loaded segment may still be mapped from `path`; swap the file, never rewrite it.
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(raw_meta).to_bytes(8, "little"))
+        f.write(raw_meta)
+        for name, data in sections:
+            f.seek(meta["sections"][name][0])
+            f.write(data)
+    os.replace(tmp, path)
+
+
+class MemorySegment:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a Hippocampus segment")
+        meta_len = int.from_bytes(self._mm[len(MAGIC):len(MAGIC) + 8], "little")
+        start = len(MAGIC) + 8
+        meta = json.loads(self._mm[start:start + meta_len])
+        if meta["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was written on a {meta['byteorder']}-endian host")
+        self.count = meta["count"]
+        self.tags = meta["tags"]
+        self.term_counts = meta["terms"]
+        view = memoryview(self._mm)
+        self._cols = {}
+        for name, (offset, length) in meta["sections"].items():
+            section = view[offset:offset + length]
+            self._cols[name] = section.cast(_COLUMNS[name]) if name in _COLUMNS else section
+
+    def __len__(self):
+        return self.count
+
+    def time_of(self, row):
+        return self._cols["times"][row]
+
+    def tags_of(self, row):
+        off = self._cols["tag_off"]
+        ids = self._cols["tag_ids"][off[row]:off[row + 1]]
+        return [self.tags[i] for i in ids]
+
+    def decode(self, row):
+        off = self._cols["blob_off"]
+        return json.loads(bytes(self._cols["blobs"][off[row]:off[row + 1]]))
+
+    def buckets(self):
+        """Yield (tag, rows, times) per tag; rows/times are zero-copy views."""
+        post_off = self._cols["post_off"]
+        for i, tag in enumerate(self.tags):
+            lo, hi = post_off[i], post_off[i + 1]
+            yield tag, self._cols["postings"][lo:hi], self._cols["post_times"][lo:hi]
+
+
+class SegmentEntry(Mapping):
+    """Read-only entry backed by a segment row; decoded on first field read.
+    Tags come from the interned tag column without touching the JSON."""
+    __slots__ = ("_segment", "_row", "_data", "eid", "doc")
+
+    def __init__(self, segment, row):
+        self._segment = segment
+        self._row = row
+        self._data = None
+
+    def __getitem__(self, key):
+        if key == "tags" and self._data is None:
+            return self._segment.tags_of(self._row)
+        return self.to_dict()[key]
+
+    def __iter__(self):
+        return iter(self.to_dict())
+
+    def __len__(self):
+        return len(self.to_dict())
+
+    def epoch(self):
+        return self._segment.time_of(self._row)
+
+    def to_dict(self):
+        if self._data is None:
+            self._data = self._segment.decode(self._row)
+        return self._data
+
+
+def _plain_entry(entry):
+    return entry.to_dict() if hasattr(entry, "to_dict") else entry
+
+
+def _align(n, to=8):
+    return (n + to - 1) // to * to
@@ -0,0 +1,44 @@
+# hippocampus_strings.py
+"""
+Hippocampus Strings – content-addressed experience store.
+Bind banners, guardian notices and repeated fb1 pastes are written
+thousands of times with identical text; every entry holding one of them
+points at the same string object, counted by reference, and the string
+leaves the table when the last entry holding it is forgotten.
+"""
+
+
+class StringTable:
+    def __init__(self):
+        self._slots = {}                 # text → [canonical text, entries holding it]
+
+    def intern(self, text):
+        """The shared copy of `text`, taking a reference on it."""
+        slot = self._slots.get(text)
+        if slot is None:
+            self._slots[text] = [text, 1]
+            return text
+        slot[1] += 1
+        return slot[0]
+
+    def release(self, text):
+        slot = self._slots.get(text)
+        if slot is not None:
+            slot[1] -= 1
+            if slot[1] <= 0:
+                del self._slots[text]
+
+    def refs(self, text):
+        slot = self._slots.get(text)
+        return slot[1] if slot else 0
+
+    def clear(self):
+        self._slots.clear()
+
+    def __len__(self):
+        return len(self._slots)
+
+    def stats(self):
+        refs = sum(slot[1] for slot in self._slots.values())
+        shared = sum(len(text) * (slot[1] - 1) for text, slot in self._slots.items())
+        return {"unique": len(self._slots), "refs": refs, "chars_deduplicated": shared}
@@ -0,0 +1,116 @@
+# hippocampus_tagindex.py
+"""
+Hippocampus Tag Index – sidecar that lets a JSON dump load without
+re-indexing. Next to `hippocampus_log.json` sits `hippocampus_log.json.tidx`
+holding each entry's timestamp (µs) and, per tag, the row numbers of its
+time-ordered bucket. It is only trusted when the CRC-32 and size it records
+match the dump being loaded (and its own body checksum holds); otherwise the
+loader rebuilds as before.
+
+Layout: MAGIC | u64 meta length | meta JSON | stamps (int64) | rows (uint32).
+"""
+
+import json
+import os
+import sys
+import zlib
+from array import array
+
+from hippocampus_entry import MemoryEntry, parse_micros
+
+MAGIC = b"HTIX\x01\x00\x00\x00"
+SUFFIX = ".tidx"
+
+
+class ChecksumWriter:
+    """File-like sink for json.dump: UTF-8 encodes into a binary file while
+    keeping the CRC-32 and size of everything written."""
+
+    def __init__(self, f, buffer_chars=1 << 16):
+        self.crc = 0
+        self.size = 0
+        self._f = f
+        self._parts = []
+        self._chars = 0
+        self._limit = buffer_chars
+
+    def write(self, text):
+        self._parts.append(text)
+        self._chars += len(text)
+        if self._chars >= self._limit:
+            self.flush()
+
+    def flush(self):
+        if self._parts:
+            data = "".join(self._parts).encode("utf-8")
+            self._parts, self._chars = [], 0
+            self.crc = zlib.crc32(data, self.crc)
+            self.size += len(data)
+            self._f.write(data)
+
+
+def write_tag_index(path, crc, size, entries, buckets, term_counts=None):
+    """Write the sidecar for a dump of `entries` (row order) with checksum
+    `crc` and byte `size`. `buckets` is [(tag, time-ordered entries)]."""
+    row_of = {id(e): r for r, e in enumerate(entries)}
+    stamps = array("q", (e.ts if isinstance(e, MemoryEntry) else parse_micros(e["timestamp"])
+                         for e in entries))
+    rows, tags = array("I"), []
+    for tag, bucket in buckets:
+        rows.extend(map(row_of.__getitem__, map(id, bucket)))
+        tags.append([tag, len(bucket)])
+    body = stamps.tobytes() + rows.tobytes()
+    meta = json.dumps({"crc": crc, "size": size, "count": len(entries), "tags": tags,
+                       "terms": dict(term_counts or {}), "byteorder": sys.byteorder,
+                       "body_crc": zlib.crc32(body)}).encode("utf-8")
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(meta).to_bytes(8, "little"))
+        f.write(meta)
+        f.write(body)
+    os.replace(tmp, path)
+
+
+class TagIndex:
+    def __init__(self, meta, stamps, rows):
+        self.count = meta["count"]
+        self.term_counts = meta["terms"]
+        self.stamps = stamps             # row → timestamp, µs since epoch
+        self._tags = meta["tags"]
+        self._rows = rows
+
+    def buckets(self):
+        """Yield (tag, rows) per tag; rows are zero-copy slices of the sidecar."""
+        off = 0
+        for tag, n in self._tags:
+            yield tag, self._rows[off:off + n]
+            off += n
+
+
+def read_tag_index(path, crc, size):
+    """The TagIndex at `path` if it was written for a dump with this `crc`
+    and `size`, else None (missing, stale, foreign or damaged)."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if data[:len(MAGIC)] != MAGIC:
+        return None
+    try:
+        start = len(MAGIC) + 8
+        end = start + int.from_bytes(data[len(MAGIC):start], "little")
+        meta = json.loads(data[start:end])
+        if meta["crc"] != crc or meta["size"] != size or meta["byteorder"] != sys.byteorder:
+            return None
+        if zlib.crc32(memoryview(data)[end:]) != meta["body_crc"]:
+            return None
+        view = memoryview(data)
+        split = end + 8 * meta["count"]
+        stamps, rows = view[end:split].cast("q"), view[split:].cast("I")
+    except (ValueError, KeyError, TypeError):
+        return None
+    if len(stamps) != meta["count"] or len(rows) != sum(n for _, n in meta["tags"]):
+        return None
+    return TagIndex(meta, stamps, rows)
@@ -0,0 +1,213 @@
+# hippocampus_tier.py
+"""
+Hippocampus Tier – compressed cold storage for old memory entries.
+The hot tail of the log stays in RAM; older entries roll into immutable
+zlib/lzma-compressed blocks on disk. Only a sparse index stays resident
+per block (time range, tag counts, earliest expiry hour), so reads skip
+blocks that cannot match and decompress the rest through a small LRU.
+
+Cold blocks are scratch: the journal/checkpoint stays the source of truth,
+and a fresh ColdStore clears whatever an earlier run left in its directory.
+"""
+
+import json
+import lzma
+import os
+import re
+import threading
+import weakref
+import zlib
+from collections import OrderedDict
+
+from hippocampus_entry import MemoryEntry
+
+CODECS = {
+    "zlib": (zlib.compress, zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+_BLOCK_NAME = re.compile(r"block-\d+\.(zlib|lzma)$")
+
+
+class ColdBlock:
+    """Resident index of one cold block; replaced, never mutated."""
+    __slots__ = ("name", "count", "t_min", "t_max", "tags", "key_min", "size")
+
+    def __init__(self, name, count, t_min, t_max, tags, key_min, size):
+        self.name = name
+        self.count = count               # entries in the block
+        self.t_min = t_min               # epoch seconds of its oldest / newest entry
+        self.t_max = t_max
+        self.tags = tags                 # tag → entries carrying it
+        self.key_min = key_min           # earliest expiry hour of any entry (None = none expire)
+        self.size = size                 # compressed bytes on disk
+
+
+class ColdStore:
+    def __init__(self, path="hippocampus_cold", hot_limit=100_000, block_size=4096,
+                 codec="zlib", cache_blocks=8):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown cold codec {codec!r}; choose from {', '.join(CODECS)}")
+        self.path = path
+        self.hot_limit = hot_limit       # entries kept in RAM before rolling
+        self.block_size = block_size     # entries per cold block
+        self.codec = codec
+        self.cache_blocks = cache_blocks # decompressed blocks kept in the LRU
+        self.blocks = []                 # ColdBlock, oldest first; replaced on change (snapshots hold it)
+        self.faults = 0                  # block reads that had to decompress
+        self.hits = 0
+        self._compress, self._decompress = CODECS[codec]
+        self._cache = OrderedDict()      # block name → [MemoryEntry]
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._pins = 0                   # live ColdViews; replaced blocks wait for them
+        self._doomed = []                # block files to delete once unpinned
+        os.makedirs(path, exist_ok=True)
+        self.clear()
+
+    def __len__(self):
+        return sum(block.count for block in self.blocks)
+
+    @property
+    def t_max(self):
+        return max((block.t_max for block in self.blocks), default=float("-inf"))
+
+    # ---------- WRITE ----------
+    def write(self, entries, key_of):
+        """Compress `entries` into a new block; `key_of(t, tags)` gives each
+        entry's expiry hour. Returns the block (already appended)."""
+        block = self._write_block(entries, key_of)
+        self.blocks = self.blocks + [block]
+        return block
+
+    def rewrite(self, block, entries, key_of):
+        """Replace `block` with one holding only `entries` (dropped if empty)."""
+        blocks = list(self.blocks)
+        i = blocks.index(block)
+        if entries:
+            blocks[i] = self._write_block(entries, key_of)
+        else:
+            del blocks[i]
+        self.blocks = blocks
+        self._discard(block)
+
+    def rekey(self, key_of):
+        """Recompute each block's earliest expiry after a retention change."""
+        self.blocks = [ColdBlock(b.name, b.count, b.t_min, b.t_max, b.tags,
+                                 _key_min(self.entries(b, cache=False), key_of), b.size)
+                       for b in self.blocks]
+
+    def clear(self):
+        with self._lock:
+            self.blocks = []
+            self._cache.clear()
+        for name in os.listdir(self.path):
+            if _BLOCK_NAME.match(name):
+                os.remove(os.path.join(self.path, name))
+
+    # ---------- READ ----------
+    def entries(self, block, cache=True):
+        """Entries of `block`, oldest stored first. [] once the block is gone
+        (expired or rewritten under a reader holding an older snapshot)."""
+        with self._lock:
+            cached = self._cache.get(block.name)
+            if cached is not None:
+                self._cache.move_to_end(block.name)
+                self.hits += 1
+                return cached
+        try:
+            with open(os.path.join(self.path, block.name), "rb") as f:
+                rows = json.loads(self._decompress(f.read()))
+        except FileNotFoundError:
+            return []
+        loaded = [MemoryEntry(row[1], row[2], row[0], *row[3:]) for row in rows]   # [ts, text, tags(, repeats)]
+        with self._lock:
+            self.faults += 1
+            if cache and self.cache_blocks > 0:
+                self._cache[block.name] = loaded
+                while len(self._cache) > self.cache_blocks:
+                    self._cache.popitem(last=False)
+        return loaded
+
+    def iter_entries(self, blocks=None):
+        """Every cold entry, oldest block first, without filling the LRU."""
+        for block in self.blocks if blocks is None else blocks:
+            yield from self.entries(block, cache=False)
+
+    def pin(self, blocks=None):
+        """A ColdView of `blocks` (default: the current ones) for another
+        thread to read; their files survive rewrites until it is released."""
+        with self._lock:
+            self._pins += 1
+        return ColdView(self, self.blocks if blocks is None else blocks)
+
+    def stats(self):
+        return {"blocks": len(self.blocks), "entries": len(self), "codec": self.codec,
+                "bytes": sum(b.size for b in self.blocks), "cached": len(self._cache),
+                "faults": self.faults, "hits": self.hits}
+
+    # ---------- INTERNAL ----------
+    def _write_block(self, entries, key_of):
+        self._seq += 1
+        name = f"block-{self._seq:06d}.{self.codec}"
+        rows, times, tags = [], [], {}
+        for entry in entries:
+            t = entry.epoch()
+            entry_tags = entry["tags"]
+            ts = entry.ts if isinstance(entry, MemoryEntry) else round(t * 1_000_000)
+            repeats = entry.get("repeats", 1)
+            rows.append((ts, entry["experience"], entry_tags) + ((repeats,) if repeats > 1 else ()))
+            times.append(t)
+            for tag in entry_tags or ["untagged"]:
+                tags[tag] = tags.get(tag, 0) + 1
+        data = self._compress(json.dumps(rows, ensure_ascii=False).encode("utf-8"))
+        final = os.path.join(self.path, name)
+        with open(final + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(final + ".tmp", final)
+        return ColdBlock(name, len(rows), min(times), max(times), tags,
+                         _key_min(entries, key_of), len(data))
+
+    def _discard(self, block):
+        with self._lock:
+            self._cache.pop(block.name, None)
+            if self._pins:
+                self._doomed.append(block.name)
+                return
+        self._remove(block.name)
+
+    def _unpin(self):
+        with self._lock:
+            self._pins -= 1
+            doomed = self._doomed if not self._pins else []
+            if doomed:
+                self._doomed = []
+        for name in doomed:
+            self._remove(name)
+
+    def _remove(self, name):
+        try:
+            os.remove(os.path.join(self.path, name))
+        except FileNotFoundError:
+            pass
+
+
+class ColdView:
+    """Iterable over a fixed list of cold blocks; unpins on release() or
+    when garbage collected, whichever comes first."""
+
+    def __init__(self, store, blocks):
+        self.blocks = blocks
+        self._store = store
+        self.release = weakref.finalize(self, store._unpin)
+
+    def __iter__(self):
+        for block in self.blocks:
+            entries = self._store.entries(block, cache=False)
+            if not entries:
+                print(f"[⚠️] Cold block {block.name} vanished before it could be read.")
+            yield from entries
+
+
+def _key_min(entries, key_of):
+    keys = [k for k in (key_of(e.epoch(), e["tags"]) for e in entries) if k is not None]
+    return min(keys) if keys else None
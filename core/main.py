@@ -49,8 +49,7 @@ thalamus.gui.on("token",      hud.push_token)
 thalamus.gui.on("log",        hud.push_log)
 
 # Warm start
-amyg.inject_emotion("resolve", 0.35)
-amyg.inject_emotion("curiosity", 0.25)
+amyg.apply_deltas({"resolve": 0.35, "curiosity": 0.25})
 
 # Start soulform loop
 def start_runtime():
@@ -0,0 +1,123 @@
+# persistence.py
+"""
+Persistence – background, double-buffered saves for Hippocampus and Amygdala.
+Callers take a cheap snapshot, hand over a `write(f)` for it and return at
+once; a single writer thread serializes it to `path.tmp`, fsyncs and renames
+it into place, so a reader only ever sees a complete file. While one write is
+in flight the next request for the same path waits in the other buffer, and
+any further request replaces it (coalescing): only the newest state is written.
+"""
+
+import os
+import threading
+import time
+
+
+class PersistenceService:
+    def __init__(self, name="HalcyonPersistence"):
+        self.name = name
+        self.requests = 0                # save requests submitted
+        self.writes = 0                  # files actually written
+        self.coalesced = 0               # requests replaced before they were written
+        self.errors = 0
+        self.bytes_written = 0
+        self.last_ms = 0.0               # write latency of the newest save
+        self.max_ms = 0.0
+        self._total_ms = 0.0
+        self._pending = {}               # path → (write, binary), waiting for the writer
+        self._busy = False               # a write is in flight
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def submit(self, path, write, binary=False):
+        """Queue `write(f)` to produce `path`. Returns True if it replaced a
+        request for the same path that had not been written yet."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"{self.name} is closed")
+            self.requests += 1
+            coalesced = path in self._pending
+            if coalesced:
+                self.coalesced += 1
+            self._pending[path] = (write, binary)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+            return coalesced
+
+    def flush(self, timeout=None):
+        """Block until every submitted save is on disk. False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def close(self, timeout=None):
+        done = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        return done
+
+    def pending(self):
+        with self._cond:
+            return len(self._pending) + self._busy
+
+    def metrics(self):
+        with self._cond:
+            return {"requests": self.requests, "writes": self.writes, "coalesced": self.coalesced,
+                    "errors": self.errors, "bytes": self.bytes_written, "last_ms": round(self.last_ms, 2),
+                    "max_ms": round(self.max_ms, 2),
+                    "avg_ms": round(self._total_ms / self.writes, 2) if self.writes else 0.0,
+                    "pending": len(self._pending) + self._busy}
+
+    # ---------- INTERNAL ----------
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                path = next(iter(self._pending))
+                write, binary = self._pending.pop(path)
+                self._busy = True
+            try:
+                self._write(path, write, binary)
+            except Exception as e:
+                with self._cond:
+                    self.errors += 1
+                print(f"[⚠️] Background save to {path} failed: {e}")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _write(self, path, write, binary):
+        t0 = time.perf_counter()
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb" if binary else "w", encoding=None if binary else "utf-8") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        size = os.path.getsize(path)
+        elapsed = (time.perf_counter() - t0) * 1000
+        with self._cond:
+            self.writes += 1
+            self.bytes_written += size
+            self.last_ms = elapsed
+            self.max_ms = max(self.max_ms, elapsed)
+            self._total_ms += elapsed
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_service():
+    """Process-wide service shared by every organ that saves in the background."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = PersistenceService()
+        return _default
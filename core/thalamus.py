@@ -5,6 +5,8 @@ import threading
 # --- Import organ systems (canonical order) ----------------------------------
 from language.language_cortex import LanguageCortex as LanguageCore
 from hippocampus import Hippocampus as MemoryCore
+from hippocampus_ingest import read_strips
+from persistence import default_service
 from amygdala import Amygdala as EmotionCore
 from neocortex import Neocortex as CognitiveCore
 from dream_occipital import DreamOccipital as DreamManager
@@ -52,7 +54,7 @@ class ConsciousThalamus:
         self.identity = {}                  # placeholder for identity state
 
         # --- Core memory & affect first --------------------------------------
-        self.memory = MemoryCore()
+        self.memory = MemoryCore(concurrent=True)   # pulse thread writes, GUI reads snapshots
         self.emotion = EmotionCore(self.memory)
 
         # --- Cortex & managers (pre-bind construction order) -----------------
@@ -97,38 +99,56 @@ class ConsciousThalamus:
     # Memory seed (identity resurrection)                                      
     # -------------------------------------------------------------------------
     def seed_initial_memory(self, strip_dir="./memory_strips"):
-        for file in os.listdir(strip_dir):
-            if not file.endswith(".json"):
+        # stream each strip file through one bulk ingest; identity anchors are
+        # picked off as its strips go by and threaded in after them
+        for file in sorted(os.listdir(strip_dir)):
+            if not file.endswith((".json", ".jsonl")):
                 continue
             try:
-                with open(os.path.join(strip_dir, file), "r") as f:
-                    data = json.load(f)
-                # ingest whole strip
-                if hasattr(self.memory, "ingest_memory_strip"):
-                    self.memory.ingest_memory_strip(data)
-                # extract identity anchors
-                if "core_directive" in data:
-                    self.identity["core_directive"] = data["core_directive"]
-                if "loop_identity" in data:
-                    # create state container if absent
-                    if not hasattr(self, "state") or not isinstance(getattr(self, "state", None), dict):
-                        self.state = {}
-                    self.state["loop_identity"] = data["loop_identity"]
-                if "anchor_memory" in data and hasattr(self.memory, "append_thread"):
-                    self.memory.append_thread(data["anchor_memory"]) 
-                # promote simple strings into long-term index if supported
-                for key, val in data.items():
-                    if isinstance(val, str) and hasattr(self.memory, "remember_long_term"):
-                        try:
-                            self.memory.remember_long_term({key: val})
-                        except Exception:
-                            pass
-                print(f"[Memory Seed] Loaded {file} with {len(data)} fields.")
+                anchors = []
+                strips = self._seed_strips(os.path.join(strip_dir, file), anchors)
+                count = 0
+                if hasattr(self.memory, "ingest_memory_strips"):
+                    count = self.memory.ingest_memory_strips(strips)
+                elif hasattr(self.memory, "ingest_memory_strip"):
+                    for data in strips:
+                        self.memory.ingest_memory_strip(data)
+                        count += 1
+                if hasattr(self.memory, "append_thread"):
+                    for anchor in anchors:
+                        self.memory.append_thread(anchor)
+                print(f"[Memory Seed] Loaded {file} with {count} strips.")
             except json.JSONDecodeError:
                 print(f"[Memory Seed Error] {file}: JSON decode error")
             except Exception as e:
                 print(f"[Memory Seed Error] {file}: {e}")
 
+    def _seed_strips(self, path, anchors):
+        # JSON object, JSON array or JSONL — read_strips never loads the whole file
+        for data in read_strips(path):
+            if isinstance(data, dict):
+                self._seed_anchors(data, anchors)
+            yield data
+
+    def _seed_anchors(self, data, anchors):
+        # extract identity anchors
+        if "core_directive" in data:
+            self.identity["core_directive"] = data["core_directive"]
+        if "loop_identity" in data:
+            # create state container if absent
+            if not hasattr(self, "state") or not isinstance(getattr(self, "state", None), dict):
+                self.state = {}
+            self.state["loop_identity"] = data["loop_identity"]
+        if "anchor_memory" in data:
+            anchors.append(data["anchor_memory"])   # threaded once the file's strips are stored
+        # promote simple strings into long-term index if supported
+        for key, val in data.items():
+            if isinstance(val, str) and hasattr(self.memory, "remember_long_term"):
+                try:
+                    self.memory.remember_long_term({key: val})
+                except Exception:
+                    pass
+
     # -------------------------------------------------------------------------
     # Bind (post-seed): wire organs with identity-aware context                 
     # -------------------------------------------------------------------------
@@ -202,8 +222,9 @@ class ConsciousThalamus:
 
     def pulse(self):
         try:
+            # An emotion core that decays on read (set_decay) owes no work per tick.
             decayer = getattr(self.emotion, "decay_emotions", None) or getattr(self.emotion, "decay", None)
-            if callable(decayer):
+            if callable(decayer) and not getattr(self.emotion, "lazy_decay", None):
                 decayer()
         except Exception as e:
             logging.debug(f"[pulse] emotion decay error: {e!r}")
@@ -223,6 +244,10 @@ class ConsciousThalamus:
             return False
         self._pulse_running = True
         self._pulse_hz = float(hz) if hz else 1.0
+        set_decay = getattr(self.emotion, "set_decay", None)
+        if callable(set_decay):
+            # Same decay the pulse would tick, applied lazily on the emotion core's next read.
+            set_decay(rate=0.01, interval=1.0 / max(0.1, self._pulse_hz))
         self._pulse_thread = threading.Thread(target=self._pulse_loop, name="HalcyonPulse", daemon=True)
         self._pulse_thread.start()
         try:
@@ -247,6 +272,14 @@ class ConsciousThalamus:
         t = getattr(self, "_pulse_thread", None)
         if t and t.is_alive():
             t.join(timeout=1.0)
+        set_decay = getattr(self.emotion, "set_decay", None)
+        if callable(set_decay):
+            set_decay(rate=None)
+        # Drain background saves queued by memory/affect while pulsing
+        default_service().flush(timeout=5.0)
+        flush_trace = getattr(self.emotion, "flush_trace", None)
+        if callable(flush_trace):
+            flush_trace(timeout=5.0)
         try:
             self.gui.emit("status", {"phase": "pulse_stop", "mu": self.mu})
         except Exception:
@@ -267,7 +300,8 @@ class ConsciousThalamus:
         t.start()
 
     def _collect_state(self):
-        emo = getattr(self.amygdala, "emotional_core", {})
+        getter = getattr(self.amygdala, "get_emotions", None)
+        emo = getter() if callable(getter) else getattr(self.amygdala, "emotional_core", {})
         # map a few vitals 0..1
         stability = min(1.0, emo.get("serenity",0.5) + emo.get("trust",0.0)*0.3)
         cognition = min(1.0, emo.get("focus",0.5))